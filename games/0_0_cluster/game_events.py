@@ -1,9 +1,11 @@
 from copy import deepcopy
+from src.events.events import deferrable_event
 
 APPLY_TUMBLE_MULTIPLIER = "applyMultiplierToTumble"
 UPDATE_GRID = "updateGrid"
 
 
+@deferrable_event
 def update_grid_mult_event(gamestate):
     """Pass updated position multipliers after a win."""
     event = {
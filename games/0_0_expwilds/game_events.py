@@ -2,7 +2,7 @@
 
 from copy import deepcopy
 from src.events.event_constants import EventConstants
-from src.events.events import json_ready_sym
+from src.events.events import json_ready_sym, deferrable_event
 
 NEW_EXP_WILDS = "newExpandingWilds"
 UPDATE_EXP_WILDS = "updateExpandingWilds"
@@ -18,10 +18,11 @@ def new_expanding_wild_event(gamestate) -> None:
         for ew in new_exp_wilds:
             ew["row"] += 1
 
-    event = {"index": len(gamestate.book.events), "type": NEW_EXP_WILDS, "newWilds": new_exp_wilds}
+    event = {"index": len(gamestate.book.events), "type": NEW_EXP_WILDS, "newWilds": [dict(ew) for ew in new_exp_wilds]}
     gamestate.book.add_event(event)
 
 
+@deferrable_event
 def update_expanding_wild_event(gamestate) -> None:
     """On each reveal - the multiplier value on the expanding wild is updated (sent before reveal)"""
     existing_wild_details = deepcopy(gamestate.expanding_wilds)
@@ -43,10 +44,11 @@ def new_sticky_event(gamestate, new_sticky_syms: list):
             sym["row"] += 1
             sym["prize"] = int(sym["prize"] * 100)
 
-    event = {"index": len(gamestate.book.events), "type": NEW_STICKY_SYMS, "newPrizes": new_sticky_syms}
+    event = {"index": len(gamestate.book.events), "type": NEW_STICKY_SYMS, "newPrizes": [dict(sym) for sym in new_sticky_syms]}
     gamestate.book.add_event(event)
 
 
+@deferrable_event
 def win_info_prize_event(gamestate, include_padding_index=True):
     """
     include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
@@ -69,6 +71,7 @@ def win_info_prize_event(gamestate, include_padding_index=True):
     gamestate.book.add_event(event)
 
 
+@deferrable_event
 def reveal_prize_event(gamestate):
     """Display the initial board drawn from reelstrips."""
     board_client = []
@@ -94,8 +97,8 @@ def reveal_prize_event(gamestate):
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": "superspin",
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
     gamestate.book.add_event(event)
@@ -1,6 +1,5 @@
 """Executables related to updating expanding wilds and collecting prize values."""
 
-import random
 from copy import deepcopy
 from game_calculations import GameCalculations
 from src.calculations.statistics import get_random_outcome
@@ -14,7 +13,7 @@ class GameExecutables(GameCalculations):
         updated_exp_wild = []
         for expwild in self.expanding_wilds:
             new_mult_on_reveal = get_random_outcome(
-                self.get_current_distribution_conditions()["mult_values"][self.gametype]
+                self.get_current_distribution_conditions()["mult_values"][self.gametype], rng=self.rng
             )
             expwild["mult"] = new_mult_on_reveal
             updated_exp_wild.append({"reel": expwild["reel"], "row": 0, "mult": new_mult_on_reveal})
@@ -27,12 +26,12 @@ class GameExecutables(GameCalculations):
         self.new_exp_wilds = []
         for _ in range(max_num_new_wilds):
             if len(self.avaliable_reels) > 0:
-                chosen_reel = random.choice(self.avaliable_reels)
-                chosen_row = random.choice([i for i in range(self.config.num_rows[chosen_reel])])
+                chosen_reel = self.rng.choice(self.avaliable_reels)
+                chosen_row = self.rng.choice([i for i in range(self.config.num_rows[chosen_reel])])
                 self.avaliable_reels.remove(chosen_reel)
 
                 wr_mult = get_random_outcome(
-                    self.get_current_distribution_conditions()["mult_values"][self.gametype]
+                    self.get_current_distribution_conditions()["mult_values"][self.gametype], rng=self.rng
                 )
                 expwild_details = {"reel": chosen_reel, "row": chosen_row, "mult": wr_mult}
                 self.board[expwild_details["reel"]][expwild_details["row"]] = self.create_symbol("W")
@@ -1,6 +1,9 @@
+from src.events.events import deferrable_event
+
 BOARD_MULT_INFO = "boardMultiplierInfo"
 
 
+@deferrable_event
 def send_mult_info_event(gamestate, board_mult: int, mult_info: dict, base_win: float, updatedWin: float):
     multiplier_info, winInfo = {}, {}
     multiplier_info["positions"] = []
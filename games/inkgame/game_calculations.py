@@ -1,6 +1,5 @@
 """Scatter pays game calculations"""
 
-import random
 from src.executables.executables import Executables
 
 
@@ -71,8 +70,8 @@ class GameCalculations(Executables):
             self.guaranteed_min_bomb_seen = True
         else:
             # Place a new M symbol on a random valid position
-            # Note: random.choice is deterministic here because reset_seed() is called
-            # at the start of run_spin, seeding the global random state
+            # Note: self.rng.choice is deterministic here because reset_seed() is called
+            # at the start of run_spin, seeding the simulation's random stream
             valid_spots = []
             for reel, _ in enumerate(self.board):
                 for row, _ in enumerate(self.board[reel]):
@@ -81,7 +80,7 @@ class GameCalculations(Executables):
                         valid_spots.append((reel, row))
             
             if valid_spots:
-                reel, row = random.choice(valid_spots)
+                reel, row = self.rng.choice(valid_spots)
                 # Replace with M symbol - create it with the exact multiplier needed
                 m_symbol = self.create_symbol("M")
                 # Override whatever multiplier was assigned to ensure we have the minimum
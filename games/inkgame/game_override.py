@@ -52,7 +52,7 @@ class GameStateOverride(GameExecutables):
         if min_req is not None:
             table = {m: w for m, w in table.items() if m >= min_req} or table
 
-        value = get_random_outcome(table)
+        value = get_random_outcome(table, rng=self.rng)
         if value is None:
             return
         symbol.assign_attribute({"multiplier": value})
@@ -1,10 +1,11 @@
 """Handles generating game-boards from reelstrips"""
 
-import random
 from typing import List
 from src.state.state import GeneralGameState
 from src.calculations.statistics import get_random_outcome
 from src.events.events import reveal_event
+import numpy as np
+from src.calculations.board_grid import EncodedReels, BoardGrid, BoardBatch, get_read_board
 
 
 class Board(GeneralGameState):
@@ -12,19 +13,22 @@ class Board(GeneralGameState):
 
     def create_board_reelstrips(self) -> None:
         """Randomly selects stopping positions from a reelstrip."""
+        if self.config.encoded_boards:
+            self.create_board_grid()
+            return
         if self.config.include_padding:
             top_symbols = []
             bottom_symbols = []
         self.refresh_special_syms()
         self.reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+            self.get_current_distribution_conditions()["reel_weights"][self.gametype], rng=self.rng
         )
         self.reelstrip = self.config.reels[self.reelstrip_id]
         anticipation = [0] * self.config.num_reels
         board = [[]] * self.config.num_reels
         for i in range(self.config.num_reels):
             board[i] = [0] * self.config.num_rows[i]
-        reel_positions = [random.randrange(0, len(self.reelstrip[reel])) for reel in range(self.config.num_reels)]
+        reel_positions = [self.rng.randrange(0, len(self.reelstrip[reel])) for reel in range(self.config.num_reels)]
         padding_positions = [0] * self.config.num_reels
         first_scatter_reel = -1
         for reel in range(self.config.num_reels):
@@ -75,6 +79,107 @@ class Board(GeneralGameState):
             self.top_symbols = top_symbols
             self.bottom_symbols = bottom_symbols
 
+    def get_encoded_reels(self) -> EncodedReels:
+        """Integer-encoded reelstrips, built on first use."""
+        if self.encoded_reels is None:
+            self.encoded_reels = EncodedReels(self.config, self.symbol_storage)
+        return self.encoded_reels
+
+    def create_board_grid(self) -> None:
+        """
+        Same draw as create_board_reelstrips, with the board stored as a BoardGrid of symbol codes.
+        Only symbols with special symbol functions are created while drawing, in the same order, so the
+        random draws and the resulting board are identical.
+        """
+        if self.config.include_padding:
+            top_symbols = []
+            bottom_symbols = []
+        self.refresh_special_syms()
+        self.reelstrip_id = get_random_outcome(
+            self.get_current_distribution_conditions()["reel_weights"][self.gametype], rng=self.rng
+        )
+        self.reelstrip = self.config.reels[self.reelstrip_id]
+        encoded_reels = self.get_encoded_reels()
+        reel_codes = encoded_reels.get_reel_codes(self.reelstrip_id)
+        names, prototypes, special = encoded_reels.names, encoded_reels.prototypes, encoded_reels.special
+        anticipation = [0] * self.config.num_reels
+        reel_positions = [self.rng.randrange(0, len(self.reelstrip[reel])) for reel in range(self.config.num_reels)]
+        padding_positions = [0] * self.config.num_reels
+        codes, symbols = [], {}
+        first_scatter_reel = -1
+        for reel in range(self.config.num_reels):
+            reel_pos = reel_positions[reel]
+            strip = reel_codes[reel]
+            num_rows = self.config.num_rows[reel]
+            if self.config.include_padding:
+                top_symbols.append(self.create_symbol(names[strip[(reel_pos - 1) % len(strip)]]))
+                bottom_symbols.append(self.create_symbol(names[strip[(reel_pos + num_rows) % len(strip)]]))
+            codes.append([strip[(reel_pos + row) % len(strip)] for row in range(num_rows)])
+            for row, code in enumerate(codes[reel]):
+                sym = prototypes[code]
+                if names[code] in self.special_symbol_functions:
+                    sym = self.create_symbol(names[code])
+                    symbols[(reel, row)] = sym
+                if special[code] and sym.special:
+                    for special_symbol in self.special_syms_on_board:
+                        if sym.name in self.config.special_symbols[special_symbol]:
+                            self.special_syms_on_board[special_symbol] += [{"reel": reel, "row": row}]
+                            if (
+                                sym.check_attribute("scatter")
+                                and len(self.special_syms_on_board[special_symbol])
+                                >= self.config.anticipation_triggers[self.gametype]
+                                and first_scatter_reel == -1
+                            ):
+                                first_scatter_reel = reel + 1
+            padding_positions[reel] = (reel_pos + num_rows + 1) % len(strip)
+
+        if first_scatter_reel > -1 and first_scatter_reel != self.config.num_reels:
+            count = 1
+            for reel in range(first_scatter_reel, self.config.num_reels):
+                anticipation[reel] = count
+                count += 1
+
+        for r in range(1, self.config.num_reels):
+            if anticipation[r - 1] > anticipation[r]:
+                raise RuntimeError
+
+        self.board = BoardGrid(encoded_reels, codes, symbols)
+        self.get_special_symbols_on_board()
+        self.reel_positions = reel_positions
+        self.padding_position = padding_positions
+        self.anticipation = anticipation
+        if self.config.include_padding:
+            self.top_symbols = top_symbols
+            self.bottom_symbols = bottom_symbols
+
+    def draw_board_batch(self, num_boards: int, rng: np.random.Generator = None, reelstrip_id: str = None) -> BoardBatch:
+        """
+        Draw many boards at once with NumPy, for statistics such as base-game RTP or reel tuning.
+        Reelstrips are drawn from the current distribution's reel weights unless reelstrip_id is given.
+        Only symbol codes are drawn: special symbol functions, padding and anticipation are not applied, and
+        the draws do not follow self.rng, so batches are not used for books.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        encoded_reels = self.get_encoded_reels()
+        if reelstrip_id is None:
+            reel_weights = self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+            reelstrip_ids = list(reel_weights)
+            weights = np.array([reel_weights[strip_id] for strip_id in reelstrip_ids], dtype=float)
+            reelstrip_index = rng.choice(len(reelstrip_ids), size=num_boards, p=weights / weights.sum())
+        else:
+            reelstrip_ids = [reelstrip_id]
+            reelstrip_index = np.zeros(num_boards, dtype=int)
+
+        reel_stops = np.zeros((num_boards, self.config.num_reels), dtype=int)
+        codes = np.full((num_boards, self.config.num_reels, max(self.config.num_rows)), -1, dtype=np.int16)
+        for index, strip_id in enumerate(reelstrip_ids):
+            boards = np.flatnonzero(reelstrip_index == index)
+            if len(boards) > 0:
+                reel_stops[boards] = encoded_reels.draw_reel_stops(strip_id, len(boards), rng)
+                codes[boards] = encoded_reels.get_board_codes(strip_id, reel_stops[boards], self.config.num_rows)
+        return BoardBatch(encoded_reels, self.config.num_rows, reelstrip_ids, reelstrip_index, reel_stops, codes)
+
     def force_board_from_reelstrips(self, reelstrip_id: str, force_stop_positions: List[List]) -> None:
         """Creates a gameboard from specified stopping positions."""
         if self.config.include_padding:
@@ -90,10 +195,10 @@ class Board(GeneralGameState):
 
         reel_positions = [None] * self.config.num_reels
         for r, s in force_stop_positions.items():
-            reel_positions[r] = s - random.randint(0, self.config.num_rows[r] - 1)
+            reel_positions[r] = s - self.rng.randint(0, self.config.num_rows[r] - 1)
         for r, _ in enumerate(reel_positions):
             if reel_positions[r] is None:
-                reel_positions[r] = random.randrange(0, len(self.reelstrip[r]))
+                reel_positions[r] = self.rng.randrange(0, len(self.reelstrip[r]))
 
         padding_positions = [0] * self.config.num_reels
         first_scatter_reel = -1
@@ -161,12 +266,16 @@ class Board(GeneralGameState):
     def get_special_symbols_on_board(self) -> None:
         """Scans board for any active special symbols."""
         self.refresh_special_syms()
-        for reel, _ in enumerate(self.board):
-            for row, _ in enumerate(self.board[reel]):
-                if self.board[reel][row].special:
-                    for specialType in list(self.special_syms_on_board.keys()):
-                        if self.board[reel][row].check_attribute(specialType):
-                            self.special_syms_on_board[specialType].append({"reel": reel, "row": row})
+        if isinstance(self.board, BoardGrid):
+            positions = self.board.get_special_positions()
+        else:
+            positions = [(reel, row) for reel, _ in enumerate(self.board) for row, _ in enumerate(self.board[reel])]
+        board = get_read_board(self.board)
+        for reel, row in positions:
+            if board[reel][row].special:
+                for specialType in list(self.special_syms_on_board.keys()):
+                    if board[reel][row].check_attribute(specialType):
+                        self.special_syms_on_board[specialType].append({"reel": reel, "row": row})
 
     def transpose_board_string(self, board_string: List[List[str]]) -> List[List[str]]:
         """Transpose symbol names in the format displayed to the player during the game."""
@@ -199,7 +308,9 @@ class Board(GeneralGameState):
             self.get_current_distribution_conditions()["force_freegame"]
             and self.gametype == self.config.basegame_type
         ):
-            num_scatters = get_random_outcome(self.get_current_distribution_conditions()["scatter_triggers"])
+            num_scatters = get_random_outcome(
+                self.get_current_distribution_conditions()["scatter_triggers"], rng=self.rng
+            )
             self.force_special_board(trigger_symbol, num_scatters)
         elif (
             not (self.get_current_distribution_conditions()["force_freegame"])
@@ -247,20 +358,18 @@ class Board(GeneralGameState):
         Helper function for forcing special (or name specific) symbols
         """
         reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+            self.get_current_distribution_conditions()["reel_weights"][self.gametype], rng=self.rng
         )
-        reelstops = self.get_syms_on_reel(reelstrip_id, force_criteria)
+        reelstops, reel_probs = self.get_reelstop_index(reelstrip_id, force_criteria)
 
-        sym_prob = []
-        for x in range(self.config.num_reels):
-            sym_prob.append(len(reelstops[x]) / len(self.config.reels[reelstrip_id][x]))
+        sym_prob = list(reel_probs)
         force_stop_positions = {}
         possible_reels = [i for i in range(self.config.num_reels) if sym_prob[i] > 0]
         possible_probs = [p for p in sym_prob if p > 0]
 
         while len(force_stop_positions) != num_force_syms and len(possible_reels) > 0:
-            chosen_reel = random.choices(possible_reels, possible_probs)[0]
-            chosen_stop = random.choice(reelstops[chosen_reel])
+            chosen_reel = self.rng.choices(possible_reels, possible_probs)[0]
+            chosen_stop = self.rng.choice(reelstops[chosen_reel])
             sym_prob[chosen_reel] = 0
             force_stop_positions[int(chosen_reel)] = int(chosen_stop)
             possible_reels = [i for i in range(self.config.num_reels) if sym_prob[i] > 0]
@@ -269,21 +378,26 @@ class Board(GeneralGameState):
         force_stop_positions = dict(sorted(force_stop_positions.items(), key=lambda x: x[0]))
         self.force_board_from_reelstrips(reelstrip_id, force_stop_positions)
 
+    def get_reelstop_index(self, reel_id: str, target_symbol: str) -> tuple:
+        """
+        Reelstop positions of a symbol name or special symbol type on each reel of a reelstrip, and the
+        probability of each reel stopping on one. Reelstrips do not change during a run, so each index is built
+        once per process and shared; the returned lists must not be modified.
+        """
+        key = (reel_id, target_symbol)
+        if key not in self.reelstop_index:
+            reel = self.config.reels[reel_id]
+            target_names = set(self.config.special_symbols.get(target_symbol, [])) | {target_symbol}
+            reelstop_positions = [
+                [s for s, name in enumerate(reel[r]) if name in target_names] for r in range(self.config.num_reels)
+            ]
+            reel_probs = [len(reelstop_positions[r]) / len(reel[r]) for r in range(self.config.num_reels)]
+            self.reelstop_index[key] = (reelstop_positions, reel_probs)
+        return self.reelstop_index[key]
+
     def get_syms_on_reel(self, reel_id: str, target_symbol: str) -> List[List]:
         """Return reelstop positions for a specific symbol name."""
-        reel = self.config.reels[reel_id]
-        reelstop_positions = [[] for _ in range(self.config.num_reels)]
-        for r in range(self.config.num_reels):
-            for s in range(len(reel[r])):
-                if (
-                    target_symbol in self.config.special_symbols
-                    and reel[r][s] in self.config.special_symbols[target_symbol]
-                ):
-                    reelstop_positions[r].append(s)
-                elif reel[r][s] == target_symbol:
-                    reelstop_positions[r].append(s)
-
-        return reelstop_positions
+        return [list(positions) for positions in self.get_reelstop_index(reel_id, target_symbol)[0]]
 
     def count_special_symbols(self, special_sym_criteria: str) -> int:
         "Returns integer number of active symbols of any 'special' kind."
@@ -292,9 +406,10 @@ class Board(GeneralGameState):
     def count_symbols_on_board(self, symbol_name: str) -> int:
         """Count number of sumbols on the board matching the target name."""
         symbol_count = 0
-        for idx, _ in enumerate(self.board):
-            for idy, _ in enumerate(self.board[idx]):
-                if self.board[idx][idy].name.upper() == symbol_name.upper():
+        board = get_read_board(self.board)
+        for idx, _ in enumerate(board):
+            for idy, _ in enumerate(board[idx]):
+                if board[idx][idy].name.upper() == symbol_name.upper():
                     symbol_count += 1
         return symbol_count
 
@@ -302,9 +417,10 @@ class Board(GeneralGameState):
         """Get symbol positions currently on board"""
         symbol_positions = {}
         symbol_positions[target_symbol] = []
-        for idx, _ in enumerate(self.board):
-            for idy, _ in enumerate(self.board[idx]):
-                if self.board[idx][idy].name == target_symbol:
+        board = get_read_board(self.board)
+        for idx, _ in enumerate(board):
+            for idy, _ in enumerate(board[idx]):
+                if board[idx][idy].name == target_symbol:
                     symbol_positions[target_symbol].append({"reel": idx, "row": idy})
 
         return symbol_positions
@@ -319,7 +435,7 @@ class Board(GeneralGameState):
 
         assert len(free_positions) >= additional_count, "not enough free place for additional symbols"
 
-        new_positions = random.choices(free_positions, additional_count)[0]
-        random.shuffle(new_positions)
+        new_positions = self.rng.choices(free_positions, additional_count)[0]
+        self.rng.shuffle(new_positions)
         for np in new_positions:
             self.board[np[0]][np[1]] = self.create_symbol(symbol_name)
@@ -0,0 +1,218 @@
+"""Integer-encoded reelstrips and boards, with Symbol objects created only when needed."""
+
+import numpy as np
+
+
+class EncodedReels:
+    """
+    Reelstrips of a game with each symbol name replaced by its code, the index of the symbol in the
+    symbol storage. Each reelstrip is encoded on first use, as NumPy arrays (for batched draws) and
+    as plain lists (for indexing single boards).
+    """
+
+    def __init__(self, config: object, symbol_storage: object):
+        self.config = config
+        self.symbol_storage = symbol_storage
+        self.names = list(symbol_storage.symbols)
+        self.codes = {name: code for code, name in enumerate(self.names)}
+        self.prototypes = [symbol_storage.symbols[name] for name in self.names]
+        self.special = [prototype.special for prototype in self.prototypes]
+        self.reel_arrays = {}
+        self.reel_codes = {}
+        self.attribute_flags = {}
+
+    def get_code(self, name: str) -> int:
+        """Code of a registered symbol name."""
+        code = self.codes.get(name)
+        if code is None:
+            raise ValueError(f"Symbol '{name}' is not registered.")
+        return code
+
+    def get_attribute_flags(self, attribute: str) -> list:
+        """Whether the prototype of each symbol code has an attribute."""
+        if attribute not in self.attribute_flags:
+            self.attribute_flags[attribute] = [prototype.check_attribute(attribute) for prototype in self.prototypes]
+        return self.attribute_flags[attribute]
+
+    def encode_reelstrip(self, reelstrip_id: str) -> None:
+        """Encode the reels of a reelstrip."""
+        reel_codes = [[self.get_code(name) for name in reel] for reel in self.config.reels[reelstrip_id]]
+        self.reel_codes[reelstrip_id] = reel_codes
+        self.reel_arrays[reelstrip_id] = [np.array(reel, dtype=np.int16) for reel in reel_codes]
+
+    def get_reel_codes(self, reelstrip_id: str) -> list:
+        """Symbol codes of each reel of a reelstrip, as lists."""
+        if reelstrip_id not in self.reel_codes:
+            self.encode_reelstrip(reelstrip_id)
+        return self.reel_codes[reelstrip_id]
+
+    def get_reel_arrays(self, reelstrip_id: str) -> list:
+        """Symbol codes of each reel of a reelstrip, as NumPy arrays."""
+        if reelstrip_id not in self.reel_arrays:
+            self.encode_reelstrip(reelstrip_id)
+        return self.reel_arrays[reelstrip_id]
+
+    def draw_reel_stops(self, reelstrip_id: str, num_boards: int, rng: np.random.Generator) -> np.ndarray:
+        """Uniform stopping positions on every reel of a reelstrip, one row per board."""
+        reel_lengths = np.array([len(reel) for reel in self.get_reel_arrays(reelstrip_id)])
+        return rng.integers(0, reel_lengths, size=(num_boards, len(reel_lengths)))
+
+    def get_board_codes(self, reelstrip_id: str, reel_stops: np.ndarray, num_rows: list) -> np.ndarray:
+        """
+        Symbol codes of the boards at the given stopping positions, with shape (boards, reels, rows).
+        Rows beyond the height of shorter reels are -1.
+        """
+        codes = np.full((len(reel_stops), len(num_rows), max(num_rows)), -1, dtype=np.int16)
+        for reel, reel_array in enumerate(self.get_reel_arrays(reelstrip_id)):
+            rows = (reel_stops[:, reel, None] + np.arange(num_rows[reel])) % len(reel_array)
+            codes[:, reel, : num_rows[reel]] = reel_array[rows]
+        return codes
+
+
+class BoardGrid:
+    """
+    Game board stored as one list of symbol codes per reel, used in place of a list of lists of Symbols.
+    Symbols are kept sparsely: only for cells whose symbol carries state (created with special symbol functions,
+    assigned to the board, or accessed through board[reel][row], which may modify it).
+    peek() and view() give read-only access without creating Symbols, returning the symbol storage prototype
+    for all other cells. Prototypes are shared and must not be modified.
+    """
+
+    def __init__(self, encoded_reels: EncodedReels, codes: list, symbols: dict = None):
+        self.encoded_reels = encoded_reels
+        self.codes = codes
+        self.symbols = {} if symbols is None else symbols
+        self.read_board = None
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, reel: int) -> object:
+        return GridReel(self, reel)
+
+    def __iter__(self):
+        for reel in range(len(self.codes)):
+            yield GridReel(self, reel)
+
+    def get_name(self, reel: int, row: int) -> str:
+        """Symbol name of a cell."""
+        return self.encoded_reels.names[self.codes[reel][row]]
+
+    def peek(self, reel: int, row: int) -> object:
+        """Symbol of a cell for reading only."""
+        symbol = self.symbols.get((reel, row))
+        if symbol is None:
+            return self.encoded_reels.prototypes[self.codes[reel][row]]
+        return symbol
+
+    def get_special_positions(self) -> list:
+        """(reel, row) of every cell holding a special symbol, in board order."""
+        special, symbols = self.encoded_reels.special, self.symbols
+        positions = []
+        for reel, reel_codes in enumerate(self.codes):
+            for row, code in enumerate(reel_codes):
+                symbol = symbols.get((reel, row))
+                if (special[code] if symbol is None else symbol.special):
+                    positions.append((reel, row))
+        return positions
+
+    def get_attribute_flags(self, attribute: str) -> list:
+        """Whether the symbol of each cell has an attribute, as one list of booleans per reel."""
+        code_flags = self.encoded_reels.get_attribute_flags(attribute)
+        flags = [[code_flags[code] for code in reel_codes] for reel_codes in self.codes]
+        for (reel, row), symbol in self.symbols.items():
+            flags[reel][row] = symbol.check_attribute(attribute)
+        return flags
+
+    def view(self) -> list:
+        """Read-only list of lists of the board symbols, kept until the board changes."""
+        if self.read_board is None:
+            self.read_board = [
+                [self.peek(reel, row) for row in range(len(self.codes[reel]))] for reel in range(len(self.codes))
+            ]
+        return self.read_board
+
+    def get_symbol(self, reel: int, row: int) -> object:
+        """Symbol of a cell which may be modified, created from its prototype on first access."""
+        symbol = self.symbols.get((reel, row))
+        if symbol is None:
+            symbol = self.encoded_reels.symbol_storage.create_symbol_state(self.get_name(reel, row))
+            self.symbols[(reel, row)] = symbol
+            self.read_board = None
+        return symbol
+
+    def set_symbol(self, reel: int, row: int, symbol: object) -> None:
+        """Place a symbol on the board."""
+        self.codes[reel][row] = self.encoded_reels.get_code(symbol.name)
+        self.symbols[(reel, row)] = symbol
+        self.read_board = None
+
+    def to_symbols(self) -> list:
+        """Board as a list of lists of Symbols, creating all remaining Symbols."""
+        return [[self.get_symbol(reel, row) for row in range(len(self.codes[reel]))] for reel in range(len(self.codes))]
+
+
+class BoardBatch:
+    """
+    Boards drawn together by Board.draw_board_batch(). For board i, reelstrip_ids[reelstrip_index[i]] is the
+    reelstrip used, reel_stops[i] the stopping position of each reel and codes[i] the symbol codes by reel and row.
+    """
+
+    def __init__(
+        self,
+        encoded_reels: EncodedReels,
+        num_rows: list,
+        reelstrip_ids: list,
+        reelstrip_index: np.ndarray,
+        reel_stops: np.ndarray,
+        codes: np.ndarray,
+    ):
+        self.encoded_reels = encoded_reels
+        self.num_rows = num_rows
+        self.reelstrip_ids = reelstrip_ids
+        self.reelstrip_index = reelstrip_index
+        self.reel_stops = reel_stops
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def get_board(self, index: int) -> BoardGrid:
+        """Single board of the batch, for evaluation with the per-board win functions."""
+        codes = [self.codes[index, reel, : self.num_rows[reel]].tolist() for reel in range(len(self.num_rows))]
+        return BoardGrid(self.encoded_reels, codes)
+
+
+class GridReel:
+    """Reel of a BoardGrid, indexed by row."""
+
+    def __init__(self, grid: BoardGrid, reel: int):
+        self.grid = grid
+        self.reel = reel
+
+    def __len__(self):
+        return len(self.grid.codes[self.reel])
+
+    def get_row(self, row: int) -> int:
+        """Row index, counting from the end of the reel for negative indexes."""
+        num_rows = len(self)
+        if not -num_rows <= row < num_rows:
+            raise IndexError("board row index out of range")
+        return row % num_rows
+
+    def __getitem__(self, row: int) -> object:
+        return self.grid.get_symbol(self.reel, self.get_row(row))
+
+    def __setitem__(self, row: int, symbol: object) -> None:
+        self.grid.set_symbol(self.reel, self.get_row(row), symbol)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self.grid.get_symbol(self.reel, row)
+
+
+def get_read_board(board) -> list:
+    """Board for reading only: the view of a BoardGrid, or the board itself."""
+    if isinstance(board, BoardGrid):
+        return board.view()
+    return board
@@ -3,6 +3,8 @@
 from src.calculations.symbol import Symbol
 from src.config.config import Config
 from src.wins.multiplier_strategy import apply_mult
+import numpy as np
+from src.calculations.board_grid import BoardGrid, BoardBatch, get_read_board
 from src.events.events import (
     win_info_event,
     set_win_event,
@@ -33,7 +35,17 @@ class Lines:
         multiplier_method: str = "symbol",
         global_multiplier: int = 1,
     ):
-        """More efficient lines calculation"""
+        """
+        More efficient lines calculation.
+        Symbols are compared by key (symbol code on a BoardGrid, name otherwise) with wild flags read once per board.
+        """
+        if isinstance(board, BoardGrid):
+            keys = board.codes
+            wilds = board.get_attribute_flags(wild_key)
+        else:
+            keys = [[sym.name for sym in reel] for reel in board]
+            wilds = [[sym.check_attribute(wild_key) for sym in reel] for reel in board]
+        board = get_read_board(board)
         return_data = {
             "totalWin": 0,
             "wins": [],
@@ -41,32 +53,29 @@ class Lines:
 
         for line_index in config.paylines.keys():
             line = config.paylines[line_index]
-            first_sym = board[0][line[0]]
-            finished_wild_win = False if first_sym.check_attribute(wild_key) else True
-            first_non_wild = first_sym if finished_wild_win else None
-            potential_line = [first_sym]
+            finished_wild_win = not wilds[0][line[0]]
+            first_non_wild = board[0][line[0]] if finished_wild_win else None
+            first_non_wild_key = keys[0][line[0]]
 
             wild_matches = 0 * (finished_wild_win) + 1 * (not (finished_wild_win))
             matches = 1 * (finished_wild_win) + 0 * (not (finished_wild_win))
             base_win, wild_win = 0, 0
 
             for reel in range(1, len(line)):
-                sym = board[reel][line[reel]]
+                row = line[reel]
                 if finished_wild_win:
-                    if sym.name == first_non_wild.name or sym.check_attribute(wild_key):
+                    if keys[reel][row] == first_non_wild_key or wilds[reel][row]:
                         matches += 1
                     else:
                         break
                 else:
-                    if sym.check_attribute(wild_key) and first_non_wild is None:
+                    if wilds[reel][row]:
                         wild_matches += 1
-                    elif first_non_wild is None:
-                        first_non_wild = sym
+                    else:
+                        first_non_wild = board[reel][row]
+                        first_non_wild_key = keys[reel][row]
                         matches += 1
                         finished_wild_win = True
-                    else:
-                        break
-                potential_line.append(sym)
 
             if (wild_matches, wild_sym) in config.paytable:
                 wild_win = config.paytable[(wild_matches, wild_sym)]
@@ -81,7 +90,7 @@ class Lines:
                         board, multiplier_method, global_multiplier=global_multiplier, win_amount=wild_win, positions=positions
                     )
                     win_dict = Lines.line_win_info(
-                        potential_line[0].name,
+                        board[0][line[0]].name,
                         wild_matches,
                         line_win,
                         positions,
@@ -117,6 +126,55 @@ class Lines:
 
         return return_data
 
+    @staticmethod
+    def count_leading(conditions: list) -> np.ndarray:
+        """Number of consecutive True values from the first reel, given one boolean array per reel."""
+        running = np.ones(len(conditions[0]), dtype=bool)
+        count = np.zeros(len(conditions[0]), dtype=np.int64)
+        for condition in conditions:
+            running &= condition
+            count += running
+        return count
+
+    @staticmethod
+    def get_lines_batch(
+        batch: BoardBatch,
+        config: Config,
+        wild_key: str = "wild",
+        wild_sym: str = "W",
+    ) -> np.ndarray:
+        """
+        Win of every payline of every board of a BoardBatch, with shape (boards, paylines).
+        Matches get_lines() with the default "symbol" multiplier method on boards without symbol multipliers.
+        """
+        encoded_reels = batch.encoded_reels
+        num_reels = batch.codes.shape[1]
+        wild_flags = np.array(encoded_reels.get_attribute_flags(wild_key), dtype=bool)
+        pays = np.zeros((num_reels + 1, len(encoded_reels.names)))
+        for (kind, name), pay in config.paytable.items():
+            if kind <= num_reels and name in encoded_reels.codes:
+                pays[kind, encoded_reels.codes[name]] = pay
+        wild_code = encoded_reels.codes.get(wild_sym)
+
+        line_wins = np.zeros((len(batch), len(config.paylines)))
+        for line_number, line_index in enumerate(config.paylines.keys()):
+            line = config.paylines[line_index]
+            line_codes = [batch.codes[:, reel, line[reel]] for reel in range(len(line))]
+            wilds = [wild_flags[reel_codes] for reel_codes in line_codes]
+            wild_matches = Lines.count_leading(wilds)
+            first_non_wild = line_codes[-1]
+            for reel in reversed(range(len(line) - 1)):
+                first_non_wild = np.where(wilds[reel], first_non_wild, line_codes[reel])
+            matches = Lines.count_leading(
+                [wild | (reel_codes == first_non_wild) for wild, reel_codes in zip(wilds, line_codes)]
+            )
+
+            base_win = np.where(wild_matches < len(line), pays[matches, first_non_wild], 0)
+            wild_win = pays[wild_matches, wild_code] if wild_code is not None else 0
+            line_wins[:, line_number] = np.round(np.maximum(base_win, wild_win), 2)
+
+        return line_wins
+
     @staticmethod
     def emit_linewin_events(gamestate) -> None:
         """Transmit win events asociated with lines wins."""
@@ -1,13 +1,21 @@
 import random
+import hashlib
 from typing import Union
 
 
-def get_random_outcome(distribution: dict, totalWeight: float = None) -> Union[float, int]:
-    """Returns a value from a distibution passed as a dictionary: {value : weight, ...}"""
+def get_stream_seed(betmode: str, criteria: str, sim: int) -> int:
+    """Seed of the independent random stream used by a single (betmode, criteria, simulation) combination."""
+    key = f"{betmode}/{criteria}/{sim}".encode("UTF-8")
+    return int(hashlib.sha256(key).hexdigest()[:16], 16)
+
+
+def get_random_outcome(distribution: dict, totalWeight: float = None, rng: random.Random = random) -> Union[float, int]:
+    """Returns a value from a distibution passed as a dictionary: {value : weight, ...}
+    Draws from rng, which should be the gamestate stream (self.rng) within game logic."""
     assert isinstance(distribution, dict), "distribution must be of type: dict "
     if totalWeight is None:
         totalWeight = sum(distribution.values())
-    roll = random.uniform(0, totalWeight)
+    roll = rng.uniform(0, totalWeight)
     cumulative = 0.0
     for value, weight in distribution.items():
         cumulative += weight
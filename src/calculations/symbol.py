@@ -1,10 +1,81 @@
 """Handle symbol classes and initial generation."""
 
 from typing import Dict
+from warnings import warn
+
+# Attributes read or assigned by the engine itself, in addition to the special_symbols properties of a game.
+ENGINE_SYMBOL_ATTRIBUTES = ("multiplier", "explode")
+SYMBOL_CLASSES = {}
+UNDECLARED_ATTRIBUTES = set()
+
+
+def get_symbol_attributes(config: object) -> tuple:
+    """Attribute schema of the symbols of a game: special symbol properties, engine and game declared attributes."""
+    attributes = []
+    for attribute in (
+        list(config.special_symbols.keys())
+        + list(ENGINE_SYMBOL_ATTRIBUTES)
+        + list(getattr(config, "symbol_attributes", []))
+    ):
+        if attribute is not None and attribute not in attributes and attribute not in Symbol.__slots__:
+            attributes.append(attribute)
+    return tuple(attributes)
+
+
+def get_symbol_class(attributes: tuple) -> type:
+    """
+    Symbol subclass for an attribute schema, created once per schema. Each attribute is stored in a private
+    slot and gets a bit in attribute_bits: assigning the attribute sets its bit in symbol.flags, unless the
+    value is False, so check_attribute is a bit test.
+    """
+    symbol_class = SYMBOL_CLASSES.get(attributes)
+    if symbol_class is None:
+        symbol_class = type(
+            "Symbol",
+            (Symbol,),
+            {
+                "__slots__": tuple("_value_" + attribute for attribute in attributes),
+                "attributes": attributes,
+                "attribute_bits": {attribute: 1 << index for index, attribute in enumerate(attributes)},
+            },
+        )
+        symbol_class.value_slots = {}
+        for attribute in attributes:
+            value_slot = symbol_class.__dict__["_value_" + attribute]
+            symbol_class.value_slots[attribute] = value_slot
+            setattr(symbol_class, attribute, get_flagged_attribute(value_slot, symbol_class.attribute_bits[attribute]))
+        SYMBOL_CLASSES[attributes] = symbol_class
+    return symbol_class
+
+
+def get_flagged_attribute(value_slot: object, bit: int) -> property:
+    """Attribute stored in value_slot which keeps its bit of symbol.flags up to date."""
+
+    def set_value(symbol, value):
+        value_slot.__set__(symbol, value)
+        if value is False:
+            symbol.flags &= ~bit
+        else:
+            symbol.flags |= bit
+
+    def delete_value(symbol):
+        value_slot.__delete__(symbol)
+        symbol.flags &= ~bit
+
+    return property(value_slot.__get__, set_value, delete_value)
+
+
+def new_symbol(attributes: tuple) -> object:
+    """Uninitialized symbol of the given schema, used when symbols are copied or pickled."""
+    return object.__new__(get_symbol_class(attributes))
 
 
 class SymbolStorage:
-    """Initial symbol generation from configuration file."""
+    """
+    Initial symbol generation from configuration file.
+    The symbol stored for each name is a prototype, built once from the config and not modified:
+    new symbol states are clones of it, so the config is not scanned again for every board cell.
+    """
 
     def __init__(self, config: object, all_symbols: list):
         self.config = config
@@ -14,7 +85,10 @@ class SymbolStorage:
 
     def create_symbol_state(self, symbol_name: str) -> object:
         """Create new symbol class instance."""
-        return Symbol(self.config, symbol_name)
+        prototype = self.symbols.get(symbol_name)
+        if prototype is None:
+            return Symbol(self.config, symbol_name)
+        return prototype.clone()
 
     def get_symbol(self, name: str) -> object:
         """Retrieve symbol class from name."""
@@ -24,23 +98,68 @@ class SymbolStorage:
 
 
 class Symbol:
-    """Create symbol from name (string) and assign relevant attributes and special functions."""
+    """
+    Create symbol from name (string) and assign relevant attributes and special functions.
+    Symbols are slot-based: Symbol(config, name) creates an instance of the subclass declaring the
+    attributes of get_symbol_attributes(config). Attributes which are not assigned are absent (hasattr is False).
+    Games assigning attributes other than their special_symbols properties should list them in
+    config.symbol_attributes; undeclared attributes are kept in the instance __dict__, which is slower.
+    """
+
+    __slots__ = (
+        "name",
+        "special_functions",
+        "special",
+        "is_paying",
+        "paytable",
+        "special_properties",
+        "flags",
+        "__dict__",
+    )
+    attributes = ()
+    attribute_bits = {}
+    value_slots = {}
+
+    def __new__(cls, config: object, name: str):
+        if cls is Symbol:
+            cls = get_symbol_class(get_symbol_attributes(config))
+        return object.__new__(cls)
 
     def __init__(self, config: object, name: str) -> None:
         self.name = name
+        self.flags = 0
         self.special_functions = []
         self.special = False
-        is_special = False
+        special_properties = []
         for special_property in config.special_symbols.keys():
             if name in config.special_symbols[special_property]:
                 setattr(self, special_property, True)
-                is_special = True
+                special_properties.append(special_property)
 
-        if is_special:
+        if len(special_properties) > 0:
             setattr(self, "special", True)
+        self.special_properties = tuple(special_properties)
 
         self.assign_paying_bool(config)
 
+    def clone(self) -> object:
+        """
+        New symbol with the attributes this symbol was created with from the config, without scanning it again.
+        The paytable is shared with this symbol, other attributes assigned since creation are not copied.
+        """
+        symbol = object.__new__(type(self))
+        symbol.name = self.name
+        symbol.special_functions = []
+        symbol.special = self.special
+        symbol.is_paying = self.is_paying
+        symbol.paytable = self.paytable
+        symbol.special_properties = self.special_properties
+        symbol.flags = self.flags
+        value_slots = self.value_slots
+        for special_property in self.special_properties:
+            value_slots[special_property].__set__(symbol, True)
+        return symbol
+
     def register_special_function(self, special_function: callable) -> None:
         """Assign special symbol function."""
         self.special_functions.append(special_function)
@@ -72,8 +191,13 @@ class Symbol:
 
     def check_attribute(self, *args) -> bool:
         """Check if an attribute exists in a given list."""
+        attribute_bits = self.attribute_bits
         for arg in args:
-            if hasattr(self, arg) and (not (isinstance(getattr(self, arg), bool)) or getattr(self, arg) is True):
+            bit = attribute_bits.get(arg)
+            if bit is not None:
+                if self.flags & bit:
+                    return True
+            elif hasattr(self, arg) and (not (isinstance(getattr(self, arg), bool)) or getattr(self, arg) is True):
                 return True
         return False
 
@@ -84,8 +208,24 @@ class Symbol:
     def assign_attribute(self, attribute_dict: dict) -> None:
         """Assign attribute value to symbol."""
         for prop, value in attribute_dict.items():
+            if prop not in self.attribute_bits and prop not in Symbol.__slots__ and prop not in UNDECLARED_ATTRIBUTES:
+                UNDECLARED_ATTRIBUTES.add(prop)
+                warn(f"Symbol attribute '{prop}' is not declared, add it to config.symbol_attributes.")
             setattr(self, prop, value)
 
+    def __reduce__(self):
+        state = {}
+        for cls in type(self).__mro__:
+            for attribute in cls.__dict__.get("__slots__", ()):
+                if attribute != "__dict__" and hasattr(self, attribute):
+                    state[attribute] = getattr(self, attribute)
+        state.update(self.__dict__)
+        return (new_symbol, (type(self).attributes,), state)
+
+    def __setstate__(self, state: dict) -> None:
+        for attribute, value in state.items():
+            setattr(self, attribute, value)
+
     def __eq__(self, name: str) -> bool:
         if self.name == name:
             return True
@@ -1,6 +1,7 @@
 from copy import copy
 from src.events.events import set_win_event, set_total_event
 from src.calculations.board import Board
+from src.calculations.board_grid import BoardGrid
 
 
 class Tumble(Board):
@@ -8,6 +9,8 @@ class Tumble(Board):
 
     def tumble_board(self) -> None:
         """Remove winning symbols from the active gameboard."""
+        if isinstance(self.board, BoardGrid):
+            self.board = self.board.to_symbols()
         self.board_before_tumble = copy(self.board)
         static_board = copy(self.board)
         self.new_symbols_from_tumble = [[] for _ in range(len(static_board))]
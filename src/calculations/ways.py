@@ -4,6 +4,7 @@ from collections import defaultdict
 from src.calculations.symbol import Symbol
 from src.config.config import Config
 from src.wins.multiplier_strategy import apply_mult
+from src.calculations.board_grid import get_read_board
 from src.events.events import (
     win_info_event,
     set_win_event,
@@ -24,6 +25,7 @@ class Ways:
         multiplier_strategy: str = "symbol",
     ):
         """Ways calculation with possibility for global multiplier application."""
+        board = get_read_board(board)
         return_data = {
             "totalWin": 0,
             "wins": [],
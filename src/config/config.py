@@ -30,6 +30,7 @@ class Config:
         self.row = 3
         self.paytable = {}  # Symbol information assumes ('kind','name) format
         self.special_symbols = {None: []}
+        self.symbol_attributes = []  # symbol attributes assigned by the game, other than special_symbols properties
         self.special_sybol_names = set()
         self.paying_symbol_names = set()
         self.all_valid_sym_names = set()
@@ -47,8 +48,13 @@ class Config:
         self.reel_location = ""
         self.reels = {}
         self.padding_reels = {}  # symbol configuration displayed before the board reveal
+        # if True, random boards are drawn as integer symbol codes (BoardGrid), creating Symbols only when needed
+        self.encoded_boards = False
 
         self.write_event_list = True
+        self.check_book_events = False  # if True, verifies book events are not modified after being recorded (slow)
+        # Defer building events for criteria averaging at least this many spin attempts per simulation, None to disable
+        self.defer_events_min_attempts = 3
 
         self.bet_modes = []
         self.opt_params = {None: None}
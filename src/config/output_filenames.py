@@ -97,8 +97,14 @@ class OutputFiles:
         for mode in self.game_config.bet_modes:
             self.force[mode.get_name()] = {
                 "folder_dir": self.force_path,
-                "names": {"force_record": f"force_record_{mode.get_name()}.json"},
-                "paths": {"force_record": os.path.join(self.force_path, f"force_record_{mode.get_name()}.json")},
+                "names": {
+                    "force_record": f"force_record_{mode.get_name()}.json",
+                    "force_record_binary": f"force_record_{mode.get_name()}.bin",
+                },
+                "paths": {
+                    "force_record": os.path.join(self.force_path, f"force_record_{mode.get_name()}.json"),
+                    "force_record_binary": os.path.join(self.force_path, f"force_record_{mode.get_name()}.bin"),
+                },
             }
 
     def assign_lookup_details(self):
@@ -142,7 +148,44 @@ class OutputFiles:
 
     def get_temp_force_name(self, betmode: str, thread_index: int, repeat_count: int):
         """Naming convention for temp force files."""
-        return os.path.join(self.temp_path, f"force_{betmode}_{thread_index}_{repeat_count}.json")
+        return os.path.join(self.temp_path, f"force_{betmode}_{thread_index}_{repeat_count}.bin")
+
+    def get_temp_shard_files(
+        self, betmode: str, thread_index: int, repeat_count: int, compress: bool, stats_only: bool = False
+    ) -> list:
+        """All temporary files written for a single simulation chunk. Stats-only chunks write no books."""
+        temp_files = [
+            self.get_temp_force_name(betmode, thread_index, repeat_count),
+            self.get_temp_lookup_name(betmode, thread_index, repeat_count),
+            self.get_temp_segmented_name(betmode, thread_index, repeat_count),
+        ]
+        if not stats_only:
+            temp_files.insert(0, self.get_temp_multi_thread_name(betmode, thread_index, repeat_count, compress))
+        return temp_files
+
+    def get_run_manifest_name(self):
+        """Record of completed simulation chunks, used to resume interrupted runs."""
+        return os.path.join(self.temp_path, "run_manifest.jsonl")
+
+    def get_run_report_name(self, betmode: str):
+        """Per-criteria spin attempt telemetry of the last run of a betmode."""
+        return os.path.join(self.lookup_path, f"run_report_{betmode}.json")
+
+    def get_fingerprint_cache_name(self):
+        """Fingerprints of the last completed run of each betmode, used to skip unchanged modes."""
+        return os.path.join(self.library_path, "mode_fingerprints.json")
+
+    def get_betmode_output_files(self, betmode: str, compress: bool, stats_only: bool = False) -> list:
+        """Final books, lookup tables and force record written for a betmode. Stats-only runs write no books."""
+        output_files = [
+            self.get_final_lookup_name(betmode),
+            self.get_final_segmented_name(betmode),
+            self.force[betmode]["paths"]["force_record"],
+            self.force[betmode]["paths"]["force_record_binary"],
+        ]
+        if not stats_only:
+            output_files.insert(0, self.get_final_book_name(betmode, compress))
+        return output_files
 
     def get_final_book_name(self, betmode: str, compress: bool):
         """Returns final simulation books output name."""
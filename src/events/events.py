@@ -1,28 +1,45 @@
 """Defines reusable events"""
 
 from copy import deepcopy
+from functools import wraps
 from src.events.event_constants import EventConstants
+from src.calculations.board_grid import get_read_board
+
+
+def deferrable_event(build_event):
+    """
+    Skip building an event while the events of the current spin attempt are deferred.
+    Only use for events which do not modify the gamestate.
+    """
+
+    @wraps(build_event)
+    def build_if_recording(gamestate, *args, **kwargs):
+        if gamestate.book.record_events:
+            build_event(gamestate, *args, **kwargs)
+
+    return build_if_recording
 
 
 def json_ready_sym(symbol: object, special_attributes: list = None):
     """Converts a symbol to dictionary/JSON format."""
     assert special_attributes is not None
     print_sym = {"name": symbol.name}
-    attrs = vars(symbol)
-    for key, val in attrs.items():
-        if key in special_attributes and symbol.get_attribute(key) != False:
-            print_sym[key] = val
+    for key in special_attributes:
+        if hasattr(symbol, key) and symbol.get_attribute(key) != False:
+            print_sym[key] = symbol.get_attribute(key)
     return print_sym
 
 
+@deferrable_event
 def reveal_event(gamestate):
     """Display the initial board drawn from reelstrips."""
     board_client = []
+    board = get_read_board(gamestate.board)
     special_attributes = list(gamestate.config.special_symbols.keys())
-    for reel, _ in enumerate(gamestate.board):
+    for reel, _ in enumerate(board):
         board_client.append([])
-        for row in range(len(gamestate.board[reel])):
-            board_client[reel].append(json_ready_sym(gamestate.board[reel][row], special_attributes))
+        for row in range(len(board[reel])):
+            board_client[reel].append(json_ready_sym(board[reel][row], special_attributes))
 
     if gamestate.config.include_padding:
         for reel, _ in enumerate(board_client):
@@ -35,9 +52,9 @@ def reveal_event(gamestate):
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": gamestate.gametype,
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
     gamestate.book.add_event(event)
 
@@ -63,20 +80,21 @@ def fs_trigger_event(
             "index": len(gamestate.book.events),
             "type": EventConstants.FREESPINTRIGGER.value,
             "totalFs": gamestate.tot_fs,
-            "positions": scatter_positions,
+            "positions": [dict(pos) for pos in scatter_positions],
         }
     elif freegame_trigger:
         event = {
             "index": len(gamestate.book.events),
             "type": EventConstants.FREESPINRETRIGGER.value,
             "totalFs": gamestate.tot_fs,
-            "positions": scatter_positions,
+            "positions": [dict(pos) for pos in scatter_positions],
         }
 
     assert gamestate.tot_fs > 0, "total freegame (gamestate.tot_fs) must be >0"
     gamestate.book.add_event(event)
 
 
+@deferrable_event
 def set_win_event(gamestate, winlevel_key: str = "standard"):
     """Used for updating cumulative win ticker (for a single outcome)."""
     if not gamestate.wincap_triggered:
@@ -94,6 +112,7 @@ def set_win_event(gamestate, winlevel_key: str = "standard"):
         gamestate.book.add_event(event)
 
 
+@deferrable_event
 def set_total_event(gamestate):
     """Updates win amount for a betting round (including cumulative wins across multiple freespin wins)."""
     event = {
@@ -109,6 +128,7 @@ def set_total_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@deferrable_event
 def set_tumble_event(gamestate):
     """Update banner indicating wins from successive tumbles."""
     event = {
@@ -119,6 +139,7 @@ def set_tumble_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@deferrable_event
 def wincap_event(gamestate):
     """Emit to indicate end of spin actions."""
     event = {
@@ -134,6 +155,7 @@ def wincap_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@deferrable_event
 def win_info_event(gamestate, include_padding_index=True):
     """
     include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
@@ -173,6 +195,7 @@ def win_info_event(gamestate, include_padding_index=True):
     gamestate.book.add_event(event)
 
 
+@deferrable_event
 def update_tumble_win_event(gamestate):
     """Update a banner to record successive tumble wins."""
     event = {
@@ -183,6 +206,7 @@ def update_tumble_win_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@deferrable_event
 def update_freespin_event(gamestate):
     """Update the current spin number and total freegame"""
     event = {
@@ -194,6 +218,7 @@ def update_freespin_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@deferrable_event
 def freespin_end_event(gamestate, winlevel_key="endFeature"):
     """End of feature trigger."""
     event = {
@@ -205,6 +230,7 @@ def freespin_end_event(gamestate, winlevel_key="endFeature"):
     gamestate.book.add_event(event)
 
 
+@deferrable_event
 def final_win_event(gamestate):
     """Assigns final payout multiplier for a simulation."""
     event = {
@@ -215,6 +241,7 @@ def final_win_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@deferrable_event
 def update_global_mult_event(gamestate):
     """Increment global multiplier value."""
     event = {
@@ -226,6 +253,7 @@ def update_global_mult_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@deferrable_event
 def tumble_board_event(gamestate):
     """States the symbol positions removed from a board during tumble, and which new symbols should take their place."""
     special_attributes = list(gamestate.config.special_symbols.keys())
@@ -254,6 +282,7 @@ def tumble_board_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@deferrable_event
 def enter_bonus_event(gamestate) -> None:
     "Indicate feature game entry explicitly."
     event = {
@@ -4,9 +4,27 @@ from copy import deepcopy
 
 
 class Book:
-    "Stores simulation information."
+    """
+    Stores simulation information.
+    Events are recorded without copying: event builders must hand over freshly built payloads
+    which are not modified afterwards (other than through append_book_items).
+    Set check_events to keep a private copy of each event and verify this when the book is output.
+    With record_events unset, events of the spin attempt are deferred and add_event records nothing.
+    """
 
-    def __init__(self, book_id: int, criteria: str):
+    __slots__ = (
+        "id",
+        "payout_multiplier",
+        "events",
+        "criteria",
+        "basegame_wins",
+        "freegame_wins",
+        "check_events",
+        "event_copies",
+        "record_events",
+    )
+
+    def __init__(self, book_id: int, criteria: str, check_events: bool = False, record_events: bool = True):
         "Initialize simulation book"
         self.id = book_id
         self.payout_multiplier = 0.0
@@ -14,18 +32,38 @@ class Book:
         self.criteria = criteria
         self.basegame_wins = 0.0
         self.freegame_wins = 0.0
+        self.check_events = check_events
+        self.event_copies = []
+        self.record_events = record_events
 
     def add_event(self, event: dict):
         "Append event to book."
-        self.events.append(deepcopy(event))
+        if not self.record_events:
+            return
+        self.events.append(event)
+        if self.check_events:
+            self.event_copies.append(deepcopy(event))
 
     def append_book_items(self, event_id: int, appended_info: dict):
         "Modify an existing book event at position 'event_id'"
         for k, v in appended_info.items():
             self.events[event_id][k] = v
+            if self.check_events:
+                self.event_copies[event_id][k] = deepcopy(v)
+
+    def verify_events(self):
+        "Raise if any recorded event was modified after being added to the book."
+        for event, event_copy in zip(self.events, self.event_copies):
+            if event != event_copy:
+                raise RuntimeError(
+                    f"Book {self.id}: event {event_copy.get('index')} of type '{event_copy.get('type')}' "
+                    "was modified after being added. Events must be built from copies of gamestate values."
+                )
 
     def to_json(self):
         "Return JSON-ready object."
+        if self.check_events:
+            self.verify_events()
         json_book = {
             "id": self.id,
             "payoutMultiplier": int(round(self.payout_multiplier * 100, 0)),
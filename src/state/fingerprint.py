@@ -0,0 +1,129 @@
+"""Fingerprint the inputs of each betmode so unchanged modes can reuse their previous outputs."""
+
+import os
+import json
+import hashlib
+
+from src.config.paths import PROJECT_PATH, PATH_TO_GAMES
+from src.write_data.write_data import get_sha_256
+
+# Config attributes with no effect on simulation outputs
+IGNORED_CONFIG_FIELDS = ("bet_modes", "reels", "opt_params", "check_book_events", "defer_events_min_attempts")
+IGNORED_BETMODE_FIELDS = ("_force_keys",)
+
+
+def to_fingerprint_data(obj: object) -> object:
+    """Convert configuration values into JSON-serialisable data with a stable ordering."""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, dict):
+        items = [[to_fingerprint_data(k), to_fingerprint_data(v)] for k, v in obj.items()]
+        return sorted(items, key=lambda x: json.dumps(x[0]))
+    if isinstance(obj, (list, tuple)):
+        return [to_fingerprint_data(x) for x in obj]
+    if isinstance(obj, (set, frozenset)):
+        return sorted((to_fingerprint_data(x) for x in obj), key=json.dumps)
+    if callable(obj):
+        return f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', type(obj).__qualname__)}"
+    if hasattr(obj, "__dict__"):
+        fields = {k: v for k, v in vars(obj).items() if k not in IGNORED_BETMODE_FIELDS}
+        return [type(obj).__qualname__, to_fingerprint_data(fields)]
+    return repr(obj)
+
+
+def get_reel_names(conditions: object, reel_names: set) -> set:
+    """Return all reelstrip ids referenced anywhere within distribution conditions."""
+    used_reels = set()
+    if isinstance(conditions, dict):
+        for key, val in conditions.items():
+            if isinstance(key, str) and key in reel_names:
+                used_reels.add(key)
+            used_reels |= get_reel_names(val, reel_names)
+    elif isinstance(conditions, (list, tuple)):
+        for val in conditions:
+            used_reels |= get_reel_names(val, reel_names)
+    elif isinstance(conditions, str) and conditions in reel_names:
+        used_reels.add(conditions)
+    return used_reels
+
+
+def get_source_files(game_id: str) -> list:
+    """Python source files of the game folder (excluding the run-file) and of the src/ engine package."""
+    source_files = []
+    for folder in [os.path.join(PATH_TO_GAMES, game_id), os.path.join(PROJECT_PATH, "src")]:
+        for root, _, filenames in os.walk(folder):
+            for filename in filenames:
+                if filename.endswith(".py") and not (root == folder and filename == "run.py"):
+                    source_files.append(os.path.join(root, filename))
+    return sorted(source_files)
+
+
+def get_betmode_fingerprint(config: object, betmode_name: str, run_details: dict) -> str:
+    """
+    Hash of everything which determines the outputs of a single betmode:
+    game configuration fields, the betmode and its distributions, reelstrips used by the betmode,
+    the game and engine source code, and the run settings affecting the output format.
+    """
+    betmode = config.get_betmode(betmode_name)
+    reels_used = set()
+    for d in betmode.get_distributions():
+        reels_used |= get_reel_names(d._conditions, set(config.reels))
+
+    fingerprint = hashlib.sha256()
+    fingerprint_data = {
+        "run_details": run_details,
+        "config": {k: v for k, v in vars(config).items() if k not in IGNORED_CONFIG_FIELDS},
+        "betmode": betmode,
+        "reels": {r: config.reels[r] for r in sorted(reels_used)},
+    }
+    fingerprint.update(json.dumps(to_fingerprint_data(fingerprint_data)).encode("UTF-8"))
+    for filename in get_source_files(config.game_id):
+        fingerprint.update(os.path.relpath(filename, PROJECT_PATH).encode("UTF-8"))
+        fingerprint.update(get_sha_256(filename).encode("UTF-8"))
+    return fingerprint.hexdigest()
+
+
+class FingerprintCache:
+    """
+    Fingerprint of each betmode's last completed run, stored alongside the library outputs.
+    Along with the fingerprint, the size and modification time of each output file is recorded,
+    so outputs overwritten or removed since are not reused.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.modes = {}
+        if os.path.isfile(filename):
+            try:
+                with open(filename, "r", encoding="UTF-8") as f:
+                    self.modes = json.load(f)
+            except json.JSONDecodeError:
+                self.modes = {}
+
+    @staticmethod
+    def get_file_stats(output_files: list) -> dict:
+        """Size and modification time of each output file."""
+        return {f: [os.path.getsize(f), os.stat(f).st_mtime_ns] for f in output_files}
+
+    def get_cached(self, betmode: str, fingerprint: str, output_files: list):
+        """Return the cached run details if the fingerprint and all output files are unchanged."""
+        entry = self.modes.get(betmode)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        if sorted(entry["files"]) != sorted(output_files):
+            return None
+        for f in output_files:
+            if not os.path.isfile(f) or [os.path.getsize(f), os.stat(f).st_mtime_ns] != entry["files"][f]:
+                return None
+        return entry
+
+    def record(self, betmode: str, fingerprint: str, output_files: list, force_keys: list, wins: list) -> None:
+        """Store the fingerprint and output file details of a finished betmode."""
+        self.modes[betmode] = {
+            "fingerprint": fingerprint,
+            "files": self.get_file_stats(output_files),
+            "force_keys": list(force_keys),
+            "wins": list(wins),
+        }
+        with open(self.filename, "w", encoding="UTF-8") as f:
+            json.dump(self.modes, f, indent=4)
@@ -0,0 +1,66 @@
+"""Record completed simulation chunks so an interrupted run can be resumed."""
+
+import os
+import json
+import hashlib
+from itertools import islice
+
+from src.write_data.write_data import get_sha_256
+
+RUN_KEY_BLOCK_SIZE = 100000
+
+
+def get_run_key(run_details: dict, criteria_assignment: list) -> str:
+    """Hash of all settings which determine the chunk layout and the simulation assigned to each book id."""
+    run_hash = hashlib.sha256(json.dumps(run_details, sort_keys=True).encode("UTF-8"))
+    # hashed in blocks, equal to hashing all criteria joined by newlines without building the whole string
+    criteria = iter(criteria_assignment)
+    block = [str(c) for c in islice(criteria, RUN_KEY_BLOCK_SIZE)]
+    separator = ""
+    while len(block) > 0:
+        run_hash.update((separator + "\n".join(block)).encode("UTF-8"))
+        block = [str(c) for c in islice(criteria, RUN_KEY_BLOCK_SIZE)]
+        separator = "\n"
+    return run_hash.hexdigest()
+
+
+class RunManifest:
+    """
+    Append-only record of finished chunks, stored as one JSON line per chunk alongside the temporary files.
+    Each line holds the chunk result returned by the worker, the run-key it was simulated under and the
+    sha256 of every temporary file written for the chunk.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.completed = {}
+        if os.path.isfile(filename):
+            with open(filename, "r", encoding="UTF-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Partially written final line from an interrupted run
+                        continue
+                    key = (entry["run_key"], entry["betmode"], entry["thread_index"], entry["repeat_count"])
+                    self.completed[key] = entry
+
+    def get_completed(self, run_key: str, betmode: str, thread_index: int, repeat_count: int, temp_path: str):
+        """Return the recorded chunk result if all its temporary files still exist with matching hashes."""
+        entry = self.completed.get((run_key, betmode, thread_index, repeat_count))
+        if entry is None:
+            return None
+        for filename, file_hash in entry["file_hashes"].items():
+            file_path = os.path.join(temp_path, filename)
+            if not os.path.isfile(file_path) or get_sha_256(file_path) != file_hash:
+                return None
+        return entry
+
+    def record(self, run_key: str, result: dict) -> None:
+        """Append a finished chunk result, flushed to disk before the chunk is considered complete."""
+        entry = dict(result, run_key=run_key)
+        self.completed[(run_key, entry["betmode"], entry["thread_index"], entry["repeat_count"])] = entry
+        with open(self.filename, "a", encoding="UTF-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
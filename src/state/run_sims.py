@@ -1,15 +1,69 @@
+import os
 import time
 import math
 import random
-import hashlib
-from multiprocessing import Process, Manager
+from array import array
+from multiprocessing import Pool
 import cProfile
 from warnings import warn
 import shutil
 import asyncio
-from typing import Dict
+from typing import Dict, List
 
-from src.write_data.write_data import output_lookup_and_force_files
+from src.write_data.write_data import (
+    output_lookup_and_force_files,
+    get_sha_256,
+    combine_criteria_stats,
+    write_run_report,
+)
+from src.wins.win_manager import WinManager
+from src.state.run_manifest import RunManifest, get_run_key
+from src.state.sim_assignment import SimAssignment, get_code_array
+from src.state.fingerprint import FingerprintCache, get_betmode_fingerprint
+
+CHUNKS_PER_THREAD = 8
+_WORKER_GAMESTATE = None
+
+
+def init_sim_worker(gamestate: object) -> None:
+    """Keep a single gamestate per worker process, reused across all batches and betmodes."""
+    global _WORKER_GAMESTATE
+    _WORKER_GAMESTATE = gamestate
+
+
+def run_sim_range_in_worker(sim_kwargs: dict) -> dict:
+    """Run a chunk of simulations on the worker gamestate, returning force keys, win totals and output file hashes."""
+    gamestate = _WORKER_GAMESTATE
+    gamestate.run_sim_range(**sim_kwargs)
+    betmode, thread_index, repeat_count = sim_kwargs["betmode"], sim_kwargs["thread_index"], sim_kwargs["repeat_count"]
+    temp_files = gamestate.output_files.get_temp_shard_files(
+        betmode, thread_index, repeat_count, sim_kwargs["compress"], sim_kwargs["stats_only"]
+    )
+    return {
+        "betmode": betmode,
+        "thread_index": thread_index,
+        "repeat_count": repeat_count,
+        "force_keys": list(gamestate.get_betmode(betmode).get_force_keys()),
+        "wins": get_cumulative_wins(gamestate),
+        "criteria_stats": gamestate.criteria_stats,
+        "event_items": gamestate.event_items,
+        "file_hashes": {os.path.basename(f): get_sha_256(f) for f in temp_files},
+    }
+
+
+def get_cumulative_wins(gamestate: object) -> tuple:
+    """Return (total, basegame, freegame) wins accumulated over the last simulation range."""
+    win_manager = gamestate.win_manager
+    return (
+        win_manager.total_cumulative_wins,
+        win_manager.cumulative_base_wins,
+        win_manager.cumulative_free_wins,
+    )
+
+
+def create_sim_pool(gamestate: object, threads: int) -> Pool:
+    """Start long-lived worker processes holding a copy of the gamestate."""
+    return Pool(processes=threads, initializer=init_sim_worker, initargs=(gamestate,))
 
 
 def create_books(
@@ -20,23 +74,108 @@ def create_books(
     threads: int,
     compress: bool,
     profiling: bool,
+    reuse_outputs: bool = True,
+    stats_only: bool = False,
 ):
-    """Main run-function for simulating game outcomes and outputting all files."""
+    """Main run-function for simulating game outcomes and outputting all files.
+    Betmodes whose fingerprint is unchanged since their last run keep their existing outputs, unless reuse_outputs=False.
+    With stats_only, the game logic is run without building events or books: only lookup tables, segmented
+    lookup tables and force records are written, for quickly checking RTP and hit-rates while iterating on the math.
+    """
     for key, ns in num_sim_args.items():
-        if all([ns > 0, ns > batch_size * batch_size]):
-            assert (
-                ns % (threads * batch_size) == 0
-            ), "mode-sims/(batch * threads) must be divisible with no remainder"
         num_sim_args[key] = int(ns)
 
-    if not compress and sum(num_sim_args.values()) > 1e4:
+    if not compress and not stats_only and sum(num_sim_args.values()) > 1e4:
         warn("Generating large number of uncompressed books!")
 
     if profiling and threads > 1:
         raise RuntimeError("Multithread profiling not supported, threads must = 1 with profiling enabled")
+    if profiling and stats_only:
+        raise RuntimeError("Profiling is not supported for stats-only runs")
 
     startTime = time.time()
-    print("\nCreating books...")
+    print("\nCreating lookup tables (stats-only)..." if stats_only else "\nCreating books...")
+    pool = None
+    if threads > 1 and not profiling:
+        pool = create_sim_pool(gamestate, threads)
+        print("Started", threads, "worker processes.")
+    elif not profiling:
+        init_sim_worker(gamestate)
+    try:
+        run_all_betmodes(
+            gamestate, config, num_sim_args, batch_size, threads, compress, profiling, pool, reuse_outputs, stats_only
+        )
+    except BaseException:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        raise
+    if pool is not None:
+        pool.close()
+        pool.join()
+    shutil.rmtree(gamestate.output_files.temp_path)
+    print("\nFinished creating books in", time.time() - startTime, "seconds.\n")
+
+
+def run_all_betmodes(
+    gamestate: object,
+    config: object,
+    num_sim_args: dict,
+    batch_size: int,
+    threads: int,
+    compress: bool,
+    profiling: bool,
+    pool: Pool = None,
+    reuse_outputs: bool = True,
+    stats_only: bool = False,
+):
+    """Simulate and output all files for each requested betmode.
+    All betmodes share the worker pool and each mode's output files are written as soon as its simulations finish.
+    Profiling runs each betmode in sequence on the main gamestate.
+    """
+    mode_sims = get_betmode_sim_amounts(config, num_sim_args)
+    if not profiling:
+        run_concurrent_betmodes(
+            gamestate,
+            config,
+            mode_sims,
+            batch_size,
+            threads,
+            compress,
+            pool,
+            reuse_outputs=reuse_outputs,
+            stats_only=stats_only,
+        )
+        return
+
+    for betmode_name, (nsims, set_sim_amount) in mode_sims.items():
+        gamestate.betmode = betmode_name
+        shard_indexes = run_profiled_sims(
+            batch_size,
+            config.game_id,
+            betmode_name,
+            gamestate,
+            num_sims=nsims,
+            compress=compress,
+            write_event_list=config.write_event_list,
+            set_sim_amount=set_sim_amount,
+        )
+
+        output_lookup_and_force_files(
+            threads,
+            batch_size,
+            config.game_id,
+            betmode_name,
+            gamestate,
+            num_sims=nsims,
+            compress=compress,
+            shard_indexes=shard_indexes,
+        )
+
+
+def get_betmode_sim_amounts(config: object, num_sim_args: dict) -> Dict[str, tuple]:
+    """Return (number of simulations, fixed amount criteria) for each betmode with simulations requested."""
+    mode_sims = {}
     for betmode_name in num_sim_args:
         sim_counter = 0
         for bm in config.bet_modes:
@@ -49,32 +188,148 @@ def create_books(
             set_sim_amount = True
 
         if num_sim_args[betmode_name] > 0:
-            gamestate.betmode = betmode_name
-            nsims = max(num_sim_args[betmode_name], sim_counter)
-            run_multi_process_sims(
-                threads,
-                batch_size,
-                config.game_id,
-                betmode_name,
-                gamestate,
-                num_sims=nsims,
-                compress=compress,
-                write_event_list=config.write_event_list,
-                profiling=profiling,
-                set_sim_amount=set_sim_amount,
-            )
+            mode_sims[betmode_name] = (max(num_sim_args[betmode_name], sim_counter), set_sim_amount)
+    return mode_sims
 
-            output_lookup_and_force_files(
-                threads,
-                batch_size,
-                config.game_id,
+
+def get_output_details(config: object, betmode: str, num_sims: int, compress: bool, stats_only: bool = False) -> dict:
+    """Run settings which affect the contents of a betmode's output files."""
+    return {
+        "game_id": config.game_id,
+        "betmode": betmode,
+        "num_sims": num_sims,
+        "compress": compress,
+        "output_regular_json": config.output_regular_json,
+        "write_event_list": config.write_event_list,
+        "stats_only": stats_only,
+    }
+
+
+def run_concurrent_betmodes(
+    gamestate: object,
+    config: object,
+    mode_sims: Dict[str, tuple],
+    batch_size: int,
+    threads: int,
+    compress: bool,
+    pool: Pool = None,
+    chunks_per_thread: int = CHUNKS_PER_THREAD,
+    reuse_outputs: bool = True,
+    stats_only: bool = False,
+) -> None:
+    """Queue the chunks of all betmodes on one worker pool (or run them in this process if no pool is given).
+    Output files for a mode are combined in this process once its last chunk returns, while workers continue with other modes.
+    Finished chunks are recorded in the run manifest; chunks completed by an interrupted run with the same settings are reused.
+    Betmodes with an unchanged fingerprint and untouched output files are not simulated again if reuse_outputs is set.
+    """
+    manifest = RunManifest(gamestate.output_files.get_run_manifest_name())
+    fingerprint_cache = FingerprintCache(gamestate.output_files.get_fingerprint_cache_name())
+    sim_tasks, remaining_chunks, mode_results, run_keys, fingerprints = [], {}, {}, {}, {}
+    for betmode_name, (nsims, set_sim_amount) in list(mode_sims.items()):
+        output_details = get_output_details(config, betmode_name, nsims, compress, stats_only)
+        fingerprints[betmode_name] = get_betmode_fingerprint(config, betmode_name, output_details)
+        cached = fingerprint_cache.get_cached(
+            betmode_name,
+            fingerprints[betmode_name],
+            gamestate.output_files.get_betmode_output_files(betmode_name, compress, stats_only),
+        )
+        if reuse_outputs and cached is not None:
+            print("\nBetmode", betmode_name, "is unchanged since the last run, reusing existing outputs.")
+            print_rtp(gamestate, betmode_name, [cached["wins"]], nsims, label=f"Mode '{betmode_name}'")
+            gamestate.combine_force_keys(cached["force_keys"], betmode_name)
+            if pool is not None:
+                gamestate.get_betmode(betmode_name).lock_force_keys()
+            del mode_sims[betmode_name]
+            continue
+
+        print("\nQueueing books for", config.game_id, "in", betmode_name)
+        sim_assignment = get_sim_assignment(gamestate, betmode_name, nsims, set_sim_amount)
+        run_details = dict(
+            output_details,
+            batch_size=batch_size,
+            threads=threads,
+            chunks_per_thread=chunks_per_thread,
+            fingerprint=fingerprints[betmode_name],
+        )
+        run_keys[betmode_name] = get_run_key(run_details, sim_assignment)
+        mode_results[betmode_name] = []
+        remaining_chunks[betmode_name] = 0
+        for repeat, batch_chunks in enumerate(get_sim_shards(nsims, threads, batch_size, chunks_per_thread)):
+            for task in get_sim_tasks(
                 betmode_name,
-                gamestate,
-                num_sims=nsims,
-                compress=compress,
+                batch_chunks,
+                repeat,
+                sim_assignment,
+                compress,
+                config.write_event_list,
+                stats_only,
+            ):
+                completed = manifest.get_completed(
+                    run_keys[betmode_name],
+                    betmode_name,
+                    task["thread_index"],
+                    task["repeat_count"],
+                    gamestate.output_files.temp_path,
+                )
+                if completed is not None:
+                    mode_results[betmode_name].append(completed)
+                else:
+                    sim_tasks.append(task)
+                    remaining_chunks[betmode_name] += 1
+        if len(mode_results[betmode_name]) > 0:
+            print(
+                f"Reusing {len(mode_results[betmode_name])} completed chunks from a previous run,",
+                remaining_chunks[betmode_name],
+                "left to simulate.",
             )
-    shutil.rmtree(gamestate.output_files.temp_path)
-    print("\nFinished creating books in", time.time() - startTime, "seconds.\n")
+
+    def output_betmode(betmode_name: str) -> None:
+        chunk_results = sorted(mode_results.pop(betmode_name), key=lambda x: (x["repeat_count"], x["thread_index"]))
+        nsims = mode_sims[betmode_name][0]
+        print_rtp(gamestate, betmode_name, [r["wins"] for r in chunk_results], nsims, label=f"Mode '{betmode_name}'")
+        for r in chunk_results:
+            gamestate.combine_force_keys(r["force_keys"], betmode_name)
+            gamestate.combine_event_items(r["event_items"], betmode_name)
+        if pool is not None:
+            gamestate.get_betmode(betmode_name).lock_force_keys()
+        gamestate.betmode = betmode_name
+        output_lookup_and_force_files(
+            threads,
+            batch_size,
+            config.game_id,
+            betmode_name,
+            gamestate,
+            num_sims=nsims,
+            compress=compress,
+            shard_indexes=[(r["thread_index"], r["repeat_count"]) for r in chunk_results],
+            stats_only=stats_only,
+        )
+        write_run_report(
+            gamestate, betmode_name, combine_criteria_stats([r["criteria_stats"] for r in chunk_results]), nsims
+        )
+        fingerprint_cache.record(
+            betmode_name,
+            fingerprints[betmode_name],
+            gamestate.output_files.get_betmode_output_files(betmode_name, compress, stats_only),
+            gamestate.get_betmode(betmode_name).get_force_keys(),
+            [sum(r["wins"][i] for r in chunk_results) for i in range(3)],
+        )
+
+    if pool is not None:
+        results = pool.imap_unordered(run_sim_range_in_worker, sim_tasks)
+    else:
+        results = map(run_sim_range_in_worker, sim_tasks)
+    for betmode_name in mode_sims:
+        if remaining_chunks[betmode_name] == 0:
+            output_betmode(betmode_name)
+
+    for result in results:
+        betmode_name = result["betmode"]
+        manifest.record(run_keys[betmode_name], result)
+        mode_results[betmode_name].append(result)
+        remaining_chunks[betmode_name] -= 1
+        if remaining_chunks[betmode_name] == 0:
+            output_betmode(betmode_name)
 
 
 def get_sim_splits(gamestate: object, num_sims: int, betmode_name: str) -> Dict[str, int]:
@@ -96,28 +351,75 @@ def get_sim_splits(gamestate: object, num_sims: int, betmode_name: str) -> Dict[
     return num_sims_criteria
 
 
-def assign_sim_criteria(num_sims_criteria: Dict[str, int], sims: int) -> Dict[int, str]:
-    """Assign criteria randomly to simulations based on quota defined in config."""
-    sim_allocation = [criteria for criteria, count in num_sims_criteria.items() for _ in range(count)]
+def assign_sim_criteria(num_sims_criteria: Dict[str, int], sims: int) -> array:
+    """Assign criteria codes (indexes into num_sims_criteria) randomly to simulations based on quota defined in config."""
+    sim_allocation = get_code_array(num_sims_criteria)
+    for code, count in enumerate(num_sims_criteria.values()):
+        sim_allocation.extend([code] * count)
     random.shuffle(sim_allocation)
-    return {i: sim_allocation[i] for i in range(min(sims, len(sim_allocation)))}
+    return sim_allocation[:sims]
+
+
+def split_balanced(sims: range, num_shards: int) -> List[range]:
+    """Split consecutive simulation numbers into num_shards ranges whose sizes differ by at most one."""
+    num_shards = max(1, min(num_shards, len(sims)))
+    shard_size, remainder = divmod(len(sims), num_shards)
+    shards, start = [], 0
+    for shard in range(num_shards):
+        end = start + shard_size + (shard < remainder)
+        shards.append(sims[start:end])
+        start = end
+    return shards
+
 
+def get_sim_shards(
+    num_sims: int, threads: int, batch_size: int, chunks_per_thread: int = CHUNKS_PER_THREAD
+) -> List[List[range]]:
+    """Split any number of simulations into batches of at most threads*batch_size sims,
+    with each batch split into balanced chunks to be scheduled across the workers."""
+    num_batches = max(1, math.ceil(num_sims / (threads * batch_size)))
+    shards = []
+    for batch_sims in split_balanced(range(num_sims), num_batches):
+        num_chunks = 1 if threads == 1 else threads * chunks_per_thread
+        shards.append(split_balanced(batch_sims, num_chunks))
+    return shards
 
-def string_to_int(s: str) -> int:
-    "Convert criteria name to large integer value"
-    h = hashlib.sha256(s.encode()).hexdigest()
-    return int(h[:12], 16)
+
+def get_sim_tasks(
+    betmode: str,
+    batch_chunks: List[range],
+    repeat: int,
+    sim_assignment: SimAssignment,
+    compress: bool,
+    write_event_list: bool,
+    stats_only: bool = False,
+) -> List[dict]:
+    """Worker arguments for each chunk of a batch, carrying only the criteria codes of the chunk's simulations."""
+    sim_tasks = []
+    for chunk_index, chunk_sims in enumerate(batch_chunks):
+        chunk_criteria, chunk_seeds = sim_assignment.get_chunk(chunk_sims)
+        sim_tasks.append(
+            {
+                "betmode": betmode,
+                "sim_to_criteria": chunk_criteria,
+                "sims": chunk_sims,
+                "thread_index": chunk_index,
+                "repeat_count": repeat,
+                "compress": compress,
+                "write_event_list": write_event_list,
+                "simulation_seeds": chunk_seeds,
+                "stats_only": stats_only,
+            }
+        )
+    return sim_tasks
 
 
 async def profile_and_visualize(
     game_id,
     gamestate,
-    all_betmode_configs,
     betmode,
     sim_allocation,
-    threads,
-    num_repeats,
-    sims_per_thread,
+    sims,
     repeat,
     compress,
     write_event_list,
@@ -126,7 +428,7 @@ async def profile_and_visualize(
     """Create flame-graph, automatically opens output on localhost."""
     output_string = f"games/{game_id}/simulationProfile_{betmode}.prof"
     cProfile.runctx(
-        "gamestate.run_sims(all_betmode_configs, betmode, sim_allocation, threads, num_repeats, sims_per_thread, 0, repeat, compress, write_event_list, simulation_seeds)",
+        "gamestate.run_sim_range(betmode, sim_allocation, sims, 0, repeat, compress, write_event_list, simulation_seeds)",
         globals(),
         locals(),
         output_string,
@@ -134,135 +436,114 @@ async def profile_and_visualize(
     await asyncio.create_subprocess_exec("snakeviz", output_string)
 
 
-def run_multi_process_sims(
-    threads: int,
-    batching_size: int,
+def get_sim_assignment(gamestate: object, betmode: str, num_sims: int, set_sim_amount: bool = False) -> SimAssignment:
+    """Return the criteria and seed assigned to each simulation number of a betmode, as criteria codes."""
+    if not set_sim_amount:
+        num_sims_criteria = get_sim_splits(gamestate, num_sims, betmode)
+        return SimAssignment(list(num_sims_criteria), assign_sim_criteria(num_sims_criteria, num_sims))
+
+    random.seed(0)
+    criteria_names, codes = [], array("B")
+    for bm in gamestate.config.bet_modes:
+        if bm.get_name() == betmode:
+            dists = bm.get_distributions()
+            criteria_names = list(dict.fromkeys(str(d.get_criteria()) for d in dists))
+            codes = get_code_array(criteria_names)
+            total_quota = 0.0
+            # populate fixed amount first
+            for d in dists:
+                dist_code = criteria_names.index(str(d.get_criteria()))
+                if d.get_fixed_amt() is not None:
+                    codes.extend([dist_code] * d.get_fixed_amt())
+                else:
+                    total_quota += d.get_quota()
+            # populate remaining with quota
+            if len(codes) < num_sims:
+                quota_assignment = []
+                quota_probs = []
+                for d in dists:
+                    dist_code = criteria_names.index(str(d.get_criteria()))
+                    if d.get_quota() is not None:
+                        quota_assignment.append(dist_code)
+                        quota_probs.append(d.get_quota())
+                        ncriteria = math.floor(max(1, (d.get_quota() / total_quota) * (num_sims - len(codes))))
+                        codes.extend([dist_code] * max(0, min(ncriteria, num_sims - len(codes))))
+                while len(codes) < num_sims:
+                    codes.append(random.choices(quota_assignment, quota_probs, k=1)[0])
+
+                random.shuffle(codes)
+            break
+
+    return SimAssignment(criteria_names, codes, counted_seeds=True)
+
+
+def simulate_book(gamestate: object, config: object, betmode: str, num_sims: int, book_id: int) -> dict:
+    """
+    Regenerate the book with the given id (simulation number) from a run of num_sims simulations in betmode,
+    without writing any files.
+    Each simulation draws from its own random stream, so the returned book matches the book output by create_books.
+    """
+    nsims, set_sim_amount = get_betmode_sim_amounts(config, {betmode: num_sims})[betmode]
+    sim_assignment = get_sim_assignment(gamestate, betmode, nsims, set_sim_amount)
+    sim = book_id
+    gamestate.win_manager = WinManager(
+        config.basegame_type, config.freegame_type, gamestate.get_betmode(betmode).get_wincap()
+    )
+    gamestate.betmode = betmode
+    gamestate.criteria = sim_assignment[sim]
+    gamestate.run_spin(sim, sim_assignment.get_seed(sim))
+    return gamestate.library.pop(sim + 1)
+
+
+def run_profiled_sims(
+    batch_size: int,
     game_id: str,
     betmode: str,
     gamestate: object,
     num_sims: int = 1000000,
     compress: bool = True,
     write_event_list: bool = False,
-    profiling: bool = False,
     set_sim_amount=False,
-):
-    """Setup multiprocessing manager for running all game-mode simulations."""
-    print("\nCreating books for", game_id, "in", betmode)
-    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
-    sims_per_thread = int(num_sims / threads / num_repeats)
-    if not set_sim_amount:
-        num_sims_criteria = get_sim_splits(gamestate, num_sims, betmode)
-        sim_criteria = assign_sim_criteria(num_sims_criteria, num_sims)
-        simulation_seeds = [i for i in range(len(sim_criteria))]
-        criteria_assignment = list(sim_criteria.values())
-    else:
-        for bm in gamestate.config.bet_modes:
-            if bm.get_name() == betmode:
-                dists = bm.get_distributions()
-                criteria_assignment, simulation_seeds = [], []
-                total_quota = 0.0
-                # populate fixed amount first
-                for d in dists:
-                    dist_criteria = d.get_criteria()
-                    if d.get_fixed_amt() is not None:
-                        criteria_assignment.extend([str(dist_criteria) for _ in range(d.get_fixed_amt())])
-                    else:
-                        total_quota += d.get_quota()
-                # populate remaining with quota
-                if len(criteria_assignment) < num_sims:
-                    quota_assignment = []
-                    quota_probs = []
-                    for d in dists:
-                        dist_criteria = d.get_criteria()
-                        if d.get_quota() is not None:
-                            quota_assignment.append(dist_criteria)
-                            quota_probs.append(d.get_quota())
-                            ncriteria = math.floor(
-                                max(1, (d.get_quota() / total_quota) * (num_sims - len(criteria_assignment)))
-                            )
-                            counter = 0
-                            while (len(criteria_assignment) < num_sims) and (counter < ncriteria):
-                                criteria_assignment.append(dist_criteria)
-                                counter += 1
-                    while len(criteria_assignment) < num_sims:
-                        criteria_assignment.append(random.choices(quota_assignment, quota_probs, k=1)[0])
-
-                    random.shuffle(criteria_assignment)
-                break
-
-        unique_criteria = set(criteria_assignment)
-        criteria_offset = {}
-        criteria_counter = {}
-        for c in unique_criteria:
-            criteria_offset[c] = string_to_int(c)
-            criteria_counter[c] = 0
-        simulation_seeds = []
-        for c in criteria_assignment:
-            offset_val = criteria_offset[c] + criteria_counter[c]
-            criteria_counter[c] += 1
-            simulation_seeds.append(offset_val)
-
-    for repeat in range(num_repeats):
-        print("Batch", repeat + 1, "of", num_repeats)
-        processes = []
-        manager = Manager()
-        all_betmode_configs = manager.list()
-        if profiling:
-            asyncio.run(
-                profile_and_visualize(
-                    game_id=game_id,
-                    gamestate=gamestate,
-                    all_betmode_configs=all_betmode_configs,
-                    betmode=betmode,
-                    sim_allocation=criteria_assignment,
-                    threads=threads,
-                    num_repeats=num_repeats,
-                    sims_per_thread=sims_per_thread,
-                    repeat=repeat,
-                    compress=compress,
-                    write_event_list=write_event_list,
-                    simulation_seeds=simulation_seeds,
-                )
-            )
-        elif threads == 1:
-            gamestate.run_sims(
-                betmode_copy_list=all_betmode_configs,
+) -> list:
+    """Run and profile all simulations of a betmode in this process, one batch at a time.
+    Returns the (chunk, batch) temp file indexes in sim order.
+    """
+    print("\nProfiling books for", game_id, "in", betmode)
+    sim_shards = get_sim_shards(num_sims, 1, batch_size)
+    sim_assignment = get_sim_assignment(gamestate, betmode, num_sims, set_sim_amount)
+
+    shard_indexes = []
+    for repeat, batch_chunks in enumerate(sim_shards):
+        print("Batch", repeat + 1, "of", len(sim_shards))
+        chunk_criteria, chunk_seeds = sim_assignment.get_chunk(batch_chunks[0])
+        asyncio.run(
+            profile_and_visualize(
+                game_id=game_id,
+                gamestate=gamestate,
                 betmode=betmode,
-                sim_to_criteria=criteria_assignment,
-                total_threads=threads,
-                total_repeats=num_repeats,
-                num_sims=sims_per_thread,
-                thread_index=0,
-                repeat_count=repeat,
+                sim_allocation=chunk_criteria,
+                sims=batch_chunks[0],
+                repeat=repeat,
                 compress=compress,
                 write_event_list=write_event_list,
-                simulation_seeds=simulation_seeds,
+                simulation_seeds=chunk_seeds,
             )
-        else:
-            for thread in range(threads):
-                process = Process(
-                    target=gamestate.run_sims,
-                    args=(
-                        all_betmode_configs,
-                        betmode,
-                        criteria_assignment,
-                        threads,
-                        num_repeats,
-                        sims_per_thread,
-                        thread,
-                        repeat,
-                        compress,
-                        write_event_list,
-                        simulation_seeds,
-                    ),
-                )
-                print("Started thread", thread)
-                process.start()
-                processes += [process]
-            print("All threads are online.")
-            for process in processes:
-                process.join()
-            print("Finished joining threads.")
-            gamestate.combine(all_betmode_configs, betmode)
-            gamestate.get_betmode(betmode).lock_force_keys()
-            manager.shutdown()
+        )
+        print_rtp(gamestate, betmode, [get_cumulative_wins(gamestate)], len(batch_chunks[0]))
+        shard_indexes.append((0, repeat))
+        gamestate.combine_event_items(gamestate.event_items, betmode)
+    return shard_indexes
+
+
+def print_rtp(gamestate: object, betmode: str, chunk_wins: list, num_sims: int, label: str = "Batch") -> None:
+    """Print RTP accumulated over all (total, basegame, freegame) chunk wins."""
+    mode_cost = gamestate.get_betmode(betmode).get_cost()
+    total_win, base_win, free_win = (sum(wins[i] for wins in chunk_wins) for i in range(3))
+    print(
+        label,
+        "finished with",
+        round(total_win / (num_sims * mode_cost), 3),
+        "RTP.",
+        f"[baseGame: {round(base_win/(num_sims*mode_cost), 3)}, freeGame: {round(free_win/(num_sims*mode_cost), 3)}]",
+        flush=True,
+    )
@@ -0,0 +1,259 @@
+"""Split betmode simulations into shards which can be run on separate machines sharing a directory, then merged."""
+
+import os
+import sys
+import json
+import time
+from array import array
+
+from src.write_data.write_data import (
+    output_lookup_and_force_files,
+    get_sha_256,
+    combine_criteria_stats,
+    write_run_report,
+)
+from src.state.fingerprint import FingerprintCache, get_betmode_fingerprint
+from src.state.sim_assignment import SimAssignment
+from src.state.run_sims import (
+    CHUNKS_PER_THREAD,
+    create_sim_pool,
+    init_sim_worker,
+    run_sim_range_in_worker,
+    get_betmode_sim_amounts,
+    get_sim_assignment,
+    get_output_details,
+    get_sim_shards,
+    get_sim_tasks,
+    split_balanced,
+    print_rtp,
+)
+
+
+def get_shard_plan_name(shard_path: str) -> str:
+    """Summary of all betmodes and shards written by create_shard_specs."""
+    return os.path.join(shard_path, "shard_plan.json")
+
+
+def get_shard_spec_name(shard_path: str, betmode: str, shard_index: int) -> str:
+    """Simulation details required to run a single shard."""
+    return os.path.join(shard_path, f"shard_spec_{betmode}_{shard_index}.json")
+
+
+def get_shard_codes_name(shard_path: str, betmode: str, shard_index: int) -> str:
+    """Criteria codes of every simulation of a shard, one (or two, little-endian) bytes per simulation."""
+    return os.path.join(shard_path, f"shard_codes_{betmode}_{shard_index}.bin")
+
+
+def get_shard_result_name(shard_path: str, betmode: str, shard_index: int) -> str:
+    """Chunk results of a completed shard, written once all of its temporary files exist."""
+    return os.path.join(shard_path, f"shard_result_{betmode}_{shard_index}.json")
+
+
+def write_json_atomic(filename: str, data: dict) -> None:
+    """Write to a temporary file and rename, so other machines never read a partial file."""
+    temp_name = f"{filename}.{os.getpid()}.tmp"
+    with open(temp_name, "w", encoding="UTF-8") as f:
+        json.dump(data, f)
+    os.replace(temp_name, filename)
+
+
+def write_shard_codes(filename: str, codes: array) -> None:
+    """Write criteria codes to a temporary file and rename, in little-endian byte order."""
+    if sys.byteorder == "big":
+        codes = array(codes.typecode, codes)
+        codes.byteswap()
+    temp_name = f"{filename}.{os.getpid()}.tmp"
+    with open(temp_name, "wb") as f:
+        codes.tofile(f)
+    os.replace(temp_name, filename)
+
+
+def load_shard_assignment(spec_file: str, spec: dict) -> SimAssignment:
+    """Criteria and seeds of the simulations of a shard, read from the codes file written beside its spec."""
+    codes_name = os.path.join(os.path.dirname(os.path.abspath(spec_file)), spec["codes_file"])
+    if get_sha_256(codes_name) != spec["codes_hash"]:
+        raise RuntimeError(f"Shard codes {codes_name} do not match the hash recorded in {spec_file}.")
+    start, stop = spec["sims"]
+    codes = array(spec["code_type"])
+    with open(codes_name, "rb") as f:
+        codes.fromfile(f, stop - start)
+    if sys.byteorder == "big":
+        codes.byteswap()
+    return SimAssignment(spec["criteria_names"], codes, spec["counted_seeds"], start, spec["start_counters"])
+
+
+def create_shard_specs(
+    gamestate: object, config: object, num_sim_args: dict, num_shards: int, shard_path: str, compress: bool
+) -> list:
+    """
+    Write a shard spec per (betmode, shard) holding the simulation range, the criteria names and the number of
+    earlier simulations of each criteria, with the criteria code of each simulation in a binary file beside it.
+    A plan used by merge_shards is also written. Returns the spec filenames.
+    """
+    os.makedirs(shard_path, exist_ok=True)
+    for key, ns in num_sim_args.items():
+        num_sim_args[key] = int(ns)
+    plan, spec_files = {"game_id": config.game_id, "betmodes": {}}, []
+    for betmode_name, (nsims, set_sim_amount) in get_betmode_sim_amounts(config, num_sim_args).items():
+        sim_assignment = get_sim_assignment(gamestate, betmode_name, nsims, set_sim_amount)
+        fingerprint = get_betmode_fingerprint(
+            config, betmode_name, get_output_details(config, betmode_name, nsims, compress)
+        )
+        shard_sims = split_balanced(range(nsims), num_shards)
+        plan["betmodes"][betmode_name] = {
+            "num_sims": nsims,
+            "num_shards": len(shard_sims),
+            "compress": compress,
+            "fingerprint": fingerprint,
+        }
+        for shard_index, sims in enumerate(shard_sims):
+            shard_assignment = sim_assignment.get_slice(sims)
+            codes_name = get_shard_codes_name(shard_path, betmode_name, shard_index)
+            write_shard_codes(codes_name, shard_assignment.codes)
+            spec = {
+                "game_id": config.game_id,
+                "betmode": betmode_name,
+                "num_sims": nsims,
+                "shard_index": shard_index,
+                "sims": [sims.start, sims.stop],
+                "compress": compress,
+                "fingerprint": fingerprint,
+                "criteria_names": shard_assignment.criteria_names,
+                "counted_seeds": shard_assignment.counted_seeds,
+                "start_counters": shard_assignment.start_counters,
+                "code_type": shard_assignment.codes.typecode,
+                "codes_file": os.path.basename(codes_name),
+                "codes_hash": get_sha_256(codes_name),
+            }
+            spec_files.append(get_shard_spec_name(shard_path, betmode_name, shard_index))
+            write_json_atomic(spec_files[-1], spec)
+        print(f"Created {len(shard_sims)} shard specs for {config.game_id} in {betmode_name}.")
+    write_json_atomic(get_shard_plan_name(shard_path), plan)
+    return spec_files
+
+
+def get_shard_tasks(
+    spec: dict, shard_assignment: SimAssignment, threads: int, batch_size: int, write_event_list: bool
+) -> list:
+    """
+    Worker arguments for the chunks of a shard, each carrying only the criteria codes of its simulations.
+    Temporary files are indexed by (chunk number, shard index).
+    """
+    start, stop = spec["sims"]
+    chunks = [
+        range(start + chunk.start, start + chunk.stop)
+        for batch_chunks in get_sim_shards(stop - start, threads, batch_size, CHUNKS_PER_THREAD)
+        for chunk in batch_chunks
+    ]
+    return get_sim_tasks(
+        spec["betmode"], chunks, spec["shard_index"], shard_assignment, spec["compress"], write_event_list
+    )
+
+
+def run_shard(gamestate: object, config: object, spec_file: str, threads: int, batch_size: int) -> None:
+    """Run all simulations of a shard spec, writing temporary files and the shard result beside the spec."""
+    with open(spec_file, "r", encoding="UTF-8") as f:
+        spec = json.load(f)
+    betmode_name = spec["betmode"]
+    fingerprint = get_betmode_fingerprint(
+        config, betmode_name, get_output_details(config, betmode_name, spec["num_sims"], spec["compress"])
+    )
+    if spec["game_id"] != config.game_id or spec["fingerprint"] != fingerprint:
+        raise RuntimeError(
+            f"Shard spec {spec_file} was created with a different game configuration or source code than this machine."
+        )
+
+    startTime = time.time()
+    shard_path = os.path.dirname(os.path.abspath(spec_file))
+    gamestate.output_files.temp_path = shard_path
+    sim_tasks = get_shard_tasks(
+        spec, load_shard_assignment(spec_file, spec), threads, batch_size, config.write_event_list
+    )
+    print(f"Running shard {spec['shard_index']} of {betmode_name}: simulations {spec['sims'][0]} to {spec['sims'][1]}")
+    if threads > 1:
+        pool = create_sim_pool(gamestate, threads)
+        try:
+            chunk_results = list(pool.imap_unordered(run_sim_range_in_worker, sim_tasks))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        init_sim_worker(gamestate)
+        chunk_results = [run_sim_range_in_worker(task) for task in sim_tasks]
+
+    chunk_results.sort(key=lambda x: x["thread_index"])
+    print_rtp(
+        gamestate,
+        betmode_name,
+        [r["wins"] for r in chunk_results],
+        spec["sims"][1] - spec["sims"][0],
+        label=f"Shard {spec['shard_index']}",
+    )
+    write_json_atomic(
+        get_shard_result_name(shard_path, betmode_name, spec["shard_index"]),
+        {"betmode": betmode_name, "shard_index": spec["shard_index"], "chunks": chunk_results},
+    )
+    print("Finished shard in", time.time() - startTime, "seconds.")
+
+
+def merge_shards(gamestate: object, config: object, shard_path: str, betmodes: list = None) -> None:
+    """Combine the outputs of all completed shards into the final books, lookup tables and force files."""
+    with open(get_shard_plan_name(shard_path), "r", encoding="UTF-8") as f:
+        plan = json.load(f)
+    assert plan["game_id"] == config.game_id, "Shard plan was created for a different game."
+    fingerprint_cache = FingerprintCache(gamestate.output_files.get_fingerprint_cache_name())
+    library_temp_path = gamestate.output_files.temp_path
+    gamestate.output_files.temp_path = shard_path
+    try:
+        for betmode_name, mode_plan in plan["betmodes"].items():
+            if betmodes is not None and betmode_name not in betmodes:
+                continue
+            chunk_results = []
+            for shard_index in range(mode_plan["num_shards"]):
+                result_name = get_shard_result_name(shard_path, betmode_name, shard_index)
+                if not os.path.isfile(result_name):
+                    raise RuntimeError(f"Shard {shard_index} of {betmode_name} has not finished: {result_name} missing.")
+                with open(result_name, "r", encoding="UTF-8") as f:
+                    shard_results = json.load(f)["chunks"]
+                for r in shard_results:
+                    for filename, file_hash in r["file_hashes"].items():
+                        if get_sha_256(os.path.join(shard_path, filename)) != file_hash:
+                            raise RuntimeError(f"Shard output {filename} does not match its recorded hash.")
+                chunk_results.extend(shard_results)
+
+            print_rtp(
+                gamestate,
+                betmode_name,
+                [r["wins"] for r in chunk_results],
+                mode_plan["num_sims"],
+                label=f"Mode '{betmode_name}'",
+            )
+            for r in chunk_results:
+                gamestate.combine_force_keys(r["force_keys"], betmode_name)
+                gamestate.combine_event_items(r["event_items"], betmode_name)
+            gamestate.betmode = betmode_name
+            output_lookup_and_force_files(
+                None,
+                None,
+                config.game_id,
+                betmode_name,
+                gamestate,
+                num_sims=mode_plan["num_sims"],
+                compress=mode_plan["compress"],
+                shard_indexes=[(r["thread_index"], r["repeat_count"]) for r in chunk_results],
+            )
+            write_run_report(
+                gamestate,
+                betmode_name,
+                combine_criteria_stats([r["criteria_stats"] for r in chunk_results]),
+                mode_plan["num_sims"],
+            )
+            fingerprint_cache.record(
+                betmode_name,
+                mode_plan["fingerprint"],
+                gamestate.output_files.get_betmode_output_files(betmode_name, mode_plan["compress"]),
+                gamestate.get_betmode(betmode_name).get_force_keys(),
+                [sum(r["wins"][i] for r in chunk_results) for i in range(3)],
+            )
+    finally:
+        gamestate.output_files.temp_path = library_temp_path
@@ -0,0 +1,136 @@
+"""Compact criteria and seed assignment of all simulations of a betmode."""
+
+import hashlib
+from array import array
+
+
+def string_to_int(s: str) -> int:
+    "Convert criteria name to large integer value"
+    h = hashlib.sha256(s.encode()).hexdigest()
+    return int(h[:12], 16)
+
+
+def get_code_array(criteria_names: list, codes=()) -> array:
+    """Array of criteria codes, one byte per simulation unless there are more than 256 criteria."""
+    return array("B" if len(criteria_names) <= 256 else "H", codes)
+
+
+class SimAssignment:
+    """
+    Criteria and random seed of every simulation number of a betmode.
+    Criteria are stored as small integer codes indexing criteria_names. Seeds are not stored: they are either the
+    simulation number, or with counted_seeds, the hashed criteria name plus the number of earlier simulations
+    assigned the same criteria. Indexing returns the criteria name of a simulation.
+    A slice of the simulations (such as a shard) starts at simulation number start, with start_counters holding
+    the number of simulations before it assigned to each criteria code.
+    """
+
+    def __init__(
+        self, criteria_names: list, codes: array, counted_seeds: bool = False, start: int = 0, start_counters: list = None
+    ):
+        self.criteria_names = list(criteria_names)
+        self.codes = codes
+        self.counted_seeds = counted_seeds
+        self.seed_offsets = [string_to_int(str(c)) for c in self.criteria_names] if counted_seeds else None
+        self.start = start
+        self.start_counters = [0] * len(self.criteria_names) if start_counters is None else list(start_counters)
+        self.counter_position = start
+        self.counters = list(self.start_counters)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, sim: int) -> str:
+        return self.criteria_names[self.codes[sim - self.start]]
+
+    def __iter__(self):
+        names = self.criteria_names
+        for code in self.codes:
+            yield names[code]
+
+    def get_counters(self, sim: int) -> list:
+        """Number of simulations before sim assigned to each criteria code. Cheapest when called with increasing sims."""
+        if sim < self.counter_position:
+            self.counter_position, self.counters = self.start, list(self.start_counters)
+        if sim > self.counter_position:
+            passed = self.codes[self.counter_position - self.start : sim - self.start]
+            for code in range(len(self.criteria_names)):
+                self.counters[code] += passed.count(code)
+            self.counter_position = sim
+        return list(self.counters)
+
+    def get_seed(self, sim: int) -> int:
+        """Random seed of a single simulation."""
+        if not self.counted_seeds:
+            return sim
+        code = self.codes[sim - self.start]
+        return self.seed_offsets[code] + self.get_counters(sim)[code]
+
+    def get_chunk(self, sims: range) -> tuple:
+        """(criteria, seeds) of a range of simulations, indexable by simulation number and cheap to send to workers."""
+        codes = self.codes[sims.start - self.start : sims.stop - self.start]
+        counters = self.get_counters(sims.start) if self.counted_seeds else None
+        return ChunkCriteria(sims.start, codes, self.criteria_names), ChunkSeeds(
+            sims.start, codes, self.seed_offsets, counters
+        )
+
+    def get_slice(self, sims: range) -> "SimAssignment":
+        """Assignment of a consecutive range of simulations, such as a shard."""
+        return SimAssignment(
+            self.criteria_names,
+            self.codes[sims.start - self.start : sims.stop - self.start],
+            self.counted_seeds,
+            sims.start,
+            self.get_counters(sims.start),
+        )
+
+
+class ChunkCriteria:
+    """Criteria names of a consecutive range of simulations, indexed by simulation number."""
+
+    def __init__(self, start: int, codes: array, criteria_names: list):
+        self.start = start
+        self.codes = codes
+        self.criteria_names = criteria_names
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, sim: int) -> str:
+        return self.criteria_names[self.codes[sim - self.start]]
+
+
+class ChunkSeeds:
+    """
+    Seeds of a consecutive range of simulations, indexed by simulation number. Counted seeds are derived
+    from the criteria counters at the start of the range while simulations are read in increasing order.
+    """
+
+    def __init__(self, start: int, codes: array, seed_offsets: list = None, counters: list = None):
+        self.start = start
+        self.codes = codes
+        self.seed_offsets = seed_offsets
+        self.start_counters = counters
+        self.position = 0
+        self.counters = None if counters is None else list(counters)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, sim: int) -> int:
+        if self.seed_offsets is None:
+            return sim
+        index = sim - self.start
+        if index < self.position:
+            self.position, self.counters = 0, list(self.start_counters)
+        while self.position < index:
+            self.counters[self.codes[self.position]] += 1
+            self.position += 1
+        code = self.codes[index]
+        return self.seed_offsets[code] + self.counters[code]
+
+    def __getstate__(self):
+        return {"start": self.start, "codes": self.codes, "seed_offsets": self.seed_offsets, "counters": self.start_counters}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["start"], state["codes"], state["seed_offsets"], state["counters"])
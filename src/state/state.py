@@ -1,22 +1,28 @@
-from copy import copy, deepcopy
+from copy import deepcopy
 from abc import ABC, abstractmethod
 from warnings import warn
+from array import array
 import random
+import time
 
 # from src.config.config import BetMode
 from src.wins.win_manager import WinManager
 from src.calculations.symbol import SymbolStorage
 from src.config.output_filenames import OutputFiles
 from src.state.books import Book
+from src.calculations.statistics import get_stream_seed
 from src.write_data.write_data import (
     print_recorded_wins,
     make_lookup_tables,
-    write_json,
     make_lookup_pay_split,
-    write_library_events,
+    StreamingBookWriter,
+    LookupColumns,
 )
 
 
+MAX_DESCRIPTION_KEYS = 4096
+
+
 class GeneralGameState(ABC):
     """Master gamestate which other classes inherit from."""
 
@@ -25,20 +31,35 @@ class GeneralGameState(ABC):
         self.output_files = OutputFiles(self.config)
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type, config.wincap)
         self.library = {}
+        self.lookup_columns = LookupColumns()
+        self.book_writer = None
+        self.event_items = {}
+        self.mode_event_items = {}
         self.recorded_events = {}
+        self.description_keys = {}
         self.special_symbol_functions = {}
         self.temp_wins = []
         self.create_symbol_map()
+        self.encoded_reels = None
+        self.reelstop_index = {}
         self.assign_special_sym_function()
         self.sim = 0
         self.criteria = ""
-        self.book = Book(self.sim, self.criteria)
+        self.book = Book(self.sim, self.criteria, self.config.check_book_events)
         self.repeat = True
         self.repeat_count = 0
         self.win_data = {
             "totalWin": 0,
             "wins": [],
         }
+        self.rng = random.Random()
+        self.criteria_stats = {}
+        self.defer_events = False
+        self.attempt_state = None
+        self.replay_state = None
+        self.replaying = False
+        self.simulation_seed = None
+        self.stats_only = False
         self.reset_seed()
         self.reset_book()
         self.reset_fs_spin()
@@ -62,13 +83,31 @@ class GeneralGameState(ABC):
         warn("No special symbol functions are defined")
 
     def reset_book(self) -> None:
-        """Reset global simulation variables."""
+        """Reset global simulation variables, called at the start of each spin attempt."""
+        record_events = True
+        if self.replay_state is not None:
+            self.restore_attempt_state(self.replay_state)
+            self.replay_state = None
+            self.replaying = True
+        elif self.replaying:
+            raise RuntimeError(
+                f"Replayed spin attempt of simulation {self.sim} was rejected: game logic depends on values "
+                "which are not reset at the start of each attempt. Set defer_events_min_attempts = None."
+            )
+        else:
+            self.spin_attempts += 1
+            self.attempt_start_time = time.perf_counter()
+            if self.stats_only:
+                record_events = False
+            elif self.defer_events:
+                record_events = False
+                self.attempt_state = self.get_attempt_state()
         self.temp_wins = []
         self.board = [[[] for _ in range(self.config.num_rows[x])] for x in range(self.config.num_reels)]
         self.top_symbols = None
         self.bottom_symbols = None
         self.book_id = self.sim
-        self.book = Book(self.book_id, self.criteria)
+        self.book = Book(self.book_id, self.criteria, self.config.check_book_events, record_events)
         self.win_data = {
             "totalWin": 0,
             "wins": [],
@@ -84,14 +123,51 @@ class GeneralGameState(ABC):
         self.repeat = False
         self.anticipation = [0] * self.config.num_reels
 
+    def get_attempt_state(self) -> dict:
+        """Random stream positions and counters at the start of a spin attempt, used to replay the attempt."""
+        return {
+            "rng": self.rng.getstate(),
+            "random": random.getstate(),
+            "spin_attempts": self.spin_attempts,
+            "attempt_start_time": self.attempt_start_time,
+            "repeat_count": self.repeat_count,
+        }
+
+    def restore_attempt_state(self, attempt_state: dict) -> None:
+        """Return to the start of a previously run spin attempt."""
+        self.rng.setstate(attempt_state["rng"])
+        random.setstate(attempt_state["random"])
+        self.spin_attempts = attempt_state["spin_attempts"]
+        self.attempt_start_time = attempt_state["attempt_start_time"]
+        self.repeat_count = attempt_state["repeat_count"]
+
+    def get_defer_events(self) -> bool:
+        """
+        Defer building events once the mean number of spin attempts per simulation of the current criteria
+        reaches config.defer_events_min_attempts. Deferred attempts record no events, accepted attempts
+        are replayed from their starting random state to build the book.
+        """
+        min_attempts = self.config.defer_events_min_attempts
+        stats = self.criteria_stats.get(self.criteria)
+        if min_attempts is None or stats is None:
+            return False
+        return stats["attempts"] >= min_attempts * stats["accepted"]
+
     def reset_seed(self, sim: int = 0, seed_override=None) -> None:
-        """Reset rng seed to simulation number for reproducibility."""
-        if seed_override is not None:
-            random.seed(seed_override + 1)
-        else:
-            random.seed(sim + 1)
+        """
+        Start the random stream of a simulation, keyed on (betmode, criteria, simulation number or seed_override).
+        Streams do not depend on any previous simulation, so any single book can be regenerated in isolation.
+        All draws within game logic should use self.rng. The global random module is seeded identically
+        so games drawing from it remain reproducible.
+        """
+        stream_seed = get_stream_seed(
+            getattr(self, "betmode", None), self.criteria, sim if seed_override is None else seed_override
+        )
+        self.rng.seed(stream_seed)
+        random.seed(stream_seed)
         self.sim = sim
         self.repeat_count = 0
+        self.spin_attempts = 0
 
     def reset_fs_spin(self) -> None:
         """Use if using repeat during freespin games."""
@@ -141,12 +217,26 @@ class GeneralGameState(ABC):
         Freespin triggers are most commonly used, i.e {"kind": X, "symbol": "S", "gametype": "basegame"}
         It is recommended to otherwise record rare events with several keys in order to reduce the overall file-size containing many duplicate ids
         """
-        dstr = {}
-        for k, v in description.items():
-            dstr[str(k)] = str(v)
-        self.temp_wins.append(dstr)
+        self.temp_wins.append(self.get_description_key(description))
         self.temp_wins.append(self.book_id)
 
+    def get_description_key(self, description: dict) -> tuple:
+        """
+        Sorted (key, value) string pairs identifying a recorded description.
+        Keys are interned: each distinct description is converted once per simulation chunk, and the same tuple is
+        reused afterwards. At most MAX_DESCRIPTION_KEYS descriptions are kept.
+        """
+        raw_key = tuple((type(k), k, type(v), v) for k, v in description.items())
+        try:
+            return self.description_keys[raw_key]
+        except KeyError:
+            description_key = tuple(sorted((str(k), str(v)) for k, v in description.items()))
+            if len(self.description_keys) < MAX_DESCRIPTION_KEYS:
+                self.description_keys[raw_key] = description_key
+            return description_key
+        except TypeError:
+            return tuple(sorted((str(k), str(v)) for k, v in description.items()))
+
     def check_force_keys(self, description) -> None:
         """Check and append unique force-key parameters."""
         current_mode_force_keys = self.get_current_betmode().get_force_keys()  # type:ignore
@@ -154,35 +244,61 @@ class GeneralGameState(ABC):
             if keyValue[0] not in current_mode_force_keys:
                 self.get_current_betmode().add_force_key(keyValue[0])  # type:ignore
 
-    def combine(self, modes, betmode_name) -> None:
-        """Retrieve unique force record keys."""
-        for modeConfig in modes:
-            for betmode in modeConfig:
-                if betmode.get_name() == betmode_name:
-                    break
-            force_keys = betmode.get_force_keys()  # type:ignore
-            for key in force_keys:
-                if key not in self.get_betmode(betmode_name).get_force_keys():  # type:ignore
-                    self.get_betmode(betmode_name).add_force_key(key)  # type:ignore
+    def combine_force_keys(self, force_keys, betmode_name) -> None:
+        """Add force record keys found by another process."""
+        for key in force_keys:
+            if key not in self.get_betmode(betmode_name).get_force_keys():  # type:ignore
+                self.get_betmode(betmode_name).add_force_key(key)  # type:ignore
+
+    def combine_event_items(self, event_items: dict, betmode_name: str) -> None:
+        """Add the example events of a finished chunk to the betmode's event catalog, keeping the first example of each type."""
+        mode_event_items = self.mode_event_items.setdefault(betmode_name, {})
+        for event_type, event in event_items.items():
+            if event_type not in mode_event_items:
+                mode_event_items[event_type] = event
+
+    def update_criteria_stats(self, sim_start_time: float) -> None:
+        """Accumulate spin attempts and time spent in rejected attempts for the criteria of the finished simulation."""
+        stats = self.criteria_stats.get(self.criteria)
+        if stats is None:
+            stats = {"attempts": 0, "accepted": 0, "rejected_time": 0.0, "total_time": 0.0, "repeats": {}}
+            self.criteria_stats[self.criteria] = stats
+        repeats = str(self.spin_attempts - 1)
+        stats["attempts"] += self.spin_attempts
+        stats["accepted"] += 1
+        stats["rejected_time"] += self.attempt_start_time - sim_start_time
+        stats["total_time"] += time.perf_counter() - sim_start_time
+        stats["repeats"][repeats] = stats["repeats"].get(repeats, 0) + 1
 
     def imprint_wins(self) -> None:
         """Record all events to library if criteria conditions are satisfied."""
+        if not self.book.record_events and not self.stats_only:
+            self.replay_state = self.attempt_state
+            self.run_spin(self.sim, self.simulation_seed)
+            return
+        self.replaying = False
         for temp_win_index in range(int(len(self.temp_wins) / 2)):
-            description = tuple(sorted(self.temp_wins[2 * temp_win_index].items()))
+            description = self.temp_wins[2 * temp_win_index]
             book_id = self.temp_wins[2 * temp_win_index + 1]
-            if description in self.recorded_events and (
-                book_id not in self.recorded_events[description]["bookIds"]
-            ):
-                self.recorded_events[description]["timesTriggered"] += 1
-                self.recorded_events[description]["bookIds"] += [book_id]
-            elif description not in self.recorded_events:
+            force_record = self.recorded_events.get(description)
+            if force_record is None:
                 self.check_force_keys(description)
                 self.recorded_events[description] = {
                     "timesTriggered": 1,
-                    "bookIds": [book_id],
+                    "bookIds": array("q", [book_id]),
                 }
+            elif force_record["bookIds"][-1] != book_id:
+                # book ids are recorded in increasing order, a repeated id can only be the last one
+                force_record["timesTriggered"] += 1
+                force_record["bookIds"].append(book_id)
         self.temp_wins = []
-        self.library[self.sim + 1] = copy(self.book.to_json())
+        book_json = self.book.to_json()
+        if self.book_writer is not None:
+            self.book_writer.write_book(book_json)
+        self.lookup_columns.add(book_json)
+        if self.book_writer is None and not self.stats_only:
+            # streamed (or stats-only) books are only kept as lookup table columns
+            self.library[self.sim + 1] = book_json
         self.win_manager.update_end_round_wins()
 
     def update_final_win(self) -> None:
@@ -232,21 +348,23 @@ class GeneralGameState(ABC):
         """run_freespin trigger function should be defined in gamestate."""
         print("gamestate requires def run_freespin(), currently passing when calling runFreeSpin")
 
-    def run_sims(
+    def run_sim_range(
         self,
-        betmode_copy_list,
         betmode,
         sim_to_criteria,
-        total_threads,
-        total_repeats,
-        num_sims,
+        sims,
         thread_index,
         repeat_count,
         compress=True,
         write_event_list=True,
         simulation_seeds=[],
+        stats_only=False,
     ) -> None:
-        """Assigns criteria and runs individual simulations. Results are stored in temporary file to be combined when all threads are finished."""
+        """Run the given simulation numbers and write results to temporary files indexed by (thread_index, repeat_count).
+        Outputs only depend on the simulation numbers, not on which process runs them.
+        With write_event_list, the first example of each event type is kept in self.event_items, to be combined
+        over all chunks with combine_event_items.
+        With stats_only, no events are built and no books are written, only lookup tables and force records."""
         mode_max_win = None
         for bm in self.config.bet_modes:
             if bm._name.lower() == betmode.lower():
@@ -255,36 +373,35 @@ class GeneralGameState(ABC):
 
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type, mode_max_win)
         self.library = {}
+        self.lookup_columns = LookupColumns()
         self.recorded_events = {}
+        self.description_keys = {}
+        self.criteria_stats = {}
         self.betmode = betmode
-        self.num_sims = num_sims
-        for sim in range(
-            thread_index * num_sims + (total_threads * num_sims) * repeat_count,
-            (thread_index + 1) * num_sims + (total_threads * num_sims) * repeat_count,
-        ):
-            self.criteria = sim_to_criteria[sim]
-            self.run_spin(sim, simulation_seeds[sim])
-        mode_cost = self.get_current_betmode().get_cost()
-
-        print(
-            "Thread " + str(thread_index),
-            "finished with",
-            round(self.win_manager.total_cumulative_wins / (num_sims * mode_cost), 3),
-            "RTP.",
-            f"[baseGame: {round(self.win_manager.cumulative_base_wins/(num_sims*mode_cost), 3)}, freeGame: {round(self.win_manager.cumulative_free_wins/(num_sims*mode_cost), 3)}]",
-            flush=True,
-        )
+        self.num_sims = len(sims)
+        self.stats_only = stats_only
+        if not stats_only:
+            self.book_writer = StreamingBookWriter(
+                self.output_files.get_temp_multi_thread_name(betmode, thread_index, repeat_count, compress),
+                self.config.output_regular_json,
+                write_event_list,
+            )
+        try:
+            for sim in sims:
+                self.criteria = sim_to_criteria[sim]
+                sim_start_time = time.perf_counter()
+                self.defer_events = self.get_defer_events()
+                self.simulation_seed = simulation_seeds[sim]
+                self.run_spin(sim, self.simulation_seed)
+                self.update_criteria_stats(sim_start_time)
+        finally:
+            if self.book_writer is not None:
+                self.book_writer.close()
+            self.defer_events = False
+            self.stats_only = False
+        self.event_items = self.book_writer.event_items if write_event_list and not stats_only else {}
+        self.book_writer = None
 
-        write_json(
-            self,
-            self.output_files.get_temp_multi_thread_name(
-                betmode, thread_index, repeat_count, (compress) * True + (not compress) * False
-            ),
-        )
         print_recorded_wins(self, self.output_files.get_temp_force_name(betmode, thread_index, repeat_count))
         make_lookup_tables(self, self.output_files.get_temp_lookup_name(betmode, thread_index, repeat_count))
         make_lookup_pay_split(self, self.output_files.get_temp_segmented_name(betmode, thread_index, repeat_count))
-
-        if write_event_list:
-            write_library_events(self, list(self.library.values()), betmode)
-        betmode_copy_list.append(self.config.bet_modes)
@@ -3,6 +3,7 @@
 
 from typing import List, Dict
 from src.calculations.board import Board
+from src.calculations.board_grid import get_read_board
 
 
 def apply_mult(
@@ -31,6 +32,7 @@ def apply_global_mult(win_amount: float, global_multiplier: int) -> tuple:
 
 def apply_added_symbol_mult(board: Board, win_amount: float, positions: List[Dict], multiplier_key: str) -> tuple:
     """Get multiplier attribute from all winning positions"""
+    board = get_read_board(board)
     symbol_multiplier = 0
     for pos in positions:
         if (
@@ -4,6 +4,20 @@
 class WinManager:
     """ "stores all simulation win info, at a cumulative and individual spin level"""
 
+    __slots__ = (
+        "base_game_mode",
+        "free_game_mode",
+        "max_allowed_win",
+        "total_cumulative_wins",
+        "cumulative_base_wins",
+        "cumulative_free_wins",
+        "running_bet_win",
+        "basegame_wins",
+        "freegame_wins",
+        "spin_win",
+        "tumble_win",
+    )
+
     def __init__(self, base_game_mode: str, free_game_mode: str, mode_max_win: float):
         """Initialize total simulation win values."""
         self.base_game_mode = base_game_mode
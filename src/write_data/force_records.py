@@ -0,0 +1,184 @@
+"""
+Binary force record format, used for the compact copy of force_record_<mode>.json written alongside the JSON file,
+and for the temporary force files of each simulation chunk.
+
+File layout:
+    4 bytes   magic b"FRCB"
+    4 bytes   header length (little-endian unsigned int)
+    header    UTF-8 JSON: {"version", "json_size", "entries": [[search, timesTriggered, numIds, offset, size], ...]}
+              where search is a list of [name, value] pairs, and offset/size locate the entry's ids within the body
+    body      book ids of each entry: sorted, delta-encoded and stored as unsigned LEB128 varints
+
+"json_size" is the size of the JSON force record written at the same time, so a sidecar left over from
+an older run is ignored once the JSON file is rewritten. It is null for temporary force files.
+"""
+
+import os
+import json
+import struct
+from itertools import accumulate
+
+FORCE_RECORD_MAGIC = b"FRCB"
+FORCE_RECORD_VERSION = 1
+
+
+def encode_book_ids(book_ids) -> bytes:
+    """Sort book ids and store the differences between consecutive ids as varints."""
+    encoded = bytearray()
+    previous = 0
+    for book_id in sorted(book_ids):
+        delta = book_id - previous
+        previous = book_id
+        while delta >= 0x80:
+            encoded.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        encoded.append(delta)
+    return bytes(encoded)
+
+
+def decode_book_ids(data: bytes) -> list:
+    """Return the sorted book ids of an encoded entry."""
+    if len(data) == 0 or max(data) < 0x80:
+        return list(accumulate(data))
+    book_ids, previous, delta, shift = [], 0, 0, 0
+    for byte in data:
+        delta |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            previous += delta
+            book_ids.append(previous)
+            delta, shift = 0, 0
+    return book_ids
+
+
+def get_force_record_sidecar_name(force_record_name: str) -> str:
+    """Binary sidecar filename of a JSON force record."""
+    return os.path.splitext(force_record_name)[0] + ".bin"
+
+
+class ForceEntryWriter:
+    """Collect encoded (search pairs, timesTriggered, book ids) entries and write them in the binary format."""
+
+    def __init__(self):
+        self.entries = []
+        self.body = []
+        self.offset = 0
+
+    def add(self, search: list, times_triggered: int, book_ids) -> None:
+        """Add the [name, value] search pairs of a key, with its trigger count and book ids."""
+        encoded_ids = encode_book_ids(book_ids)
+        self.entries.append([search, times_triggered, len(book_ids), self.offset, len(encoded_ids)])
+        self.body.append(encoded_ids)
+        self.offset += len(encoded_ids)
+
+    def write(self, filename: str, json_size: int = None) -> None:
+        """Write the header and all encoded book ids."""
+        header = {"version": FORCE_RECORD_VERSION, "json_size": json_size, "entries": self.entries}
+        header = json.dumps(header, separators=(",", ":")).encode("UTF-8")
+        with open(filename, "wb") as f:
+            f.write(FORCE_RECORD_MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            for encoded_ids in self.body:
+                f.write(encoded_ids)
+
+
+def write_force_record_sidecar(filename: str, force_records: list, json_size: int) -> None:
+    """Write force record entries ({"search", "timesTriggered", "bookIds"}) in the compact binary format."""
+    writer = ForceEntryWriter()
+    for record in force_records:
+        search = [[option["name"], option["value"]] for option in record["search"]]
+        writer.add(search, record["timesTriggered"], record["bookIds"])
+    writer.write(filename, json_size)
+
+
+def read_force_entries(filename: str) -> tuple:
+    """Return the header and the undecoded body of a binary force record."""
+    with open(filename, "rb") as f:
+        if f.read(4) != FORCE_RECORD_MAGIC:
+            raise RuntimeError(f"{filename} is not a binary force record.")
+        (header_size,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_size).decode("UTF-8"))
+        body = f.read()
+
+    if header["version"] != FORCE_RECORD_VERSION:
+        raise RuntimeError(f"Unsupported binary force record version {header['version']} in {filename}.")
+    return header, body
+
+
+def read_force_record_sidecar(filename: str) -> tuple:
+    """Return the header and the decoded force record entries of a binary sidecar."""
+    header, body = read_force_entries(filename)
+    force_records = []
+    for search, times_triggered, _, offset, size in header["entries"]:
+        force_records.append(
+            {
+                "search": [{"name": name, "value": value} for name, value in search],
+                "timesTriggered": times_triggered,
+                "bookIds": decode_book_ids(body[offset : offset + size]),
+            }
+        )
+    return header, force_records
+
+
+def load_force_record(force_record_name: str) -> list:
+    """
+    Load the entries of force_record_<mode>.json, reading the binary sidecar instead when it exists
+    and was written together with the JSON file.
+    """
+    sidecar_name = get_force_record_sidecar_name(force_record_name)
+    if os.path.isfile(sidecar_name):
+        header, force_records = read_force_record_sidecar(sidecar_name)
+        if not os.path.isfile(force_record_name) or os.path.getsize(force_record_name) == header["json_size"]:
+            return force_records
+
+    with open(force_record_name, "r", encoding="UTF-8") as f:
+        return json.load(f)
+
+
+def write_recorded_events(filename: str, recorded_events: dict) -> None:
+    """Write the force descriptions recorded by a simulation chunk to a temporary binary force file."""
+    writer = ForceEntryWriter()
+    for description, force_record in recorded_events.items():
+        writer.add(description, force_record["timesTriggered"], force_record["bookIds"])
+    writer.write(filename)
+
+
+def get_json_list_item(item: object) -> str:
+    """An item of a list serialized with json.dumps(list, indent=4)."""
+    return "\n".join("    " + line for line in json.dumps(item, indent=4).split("\n"))
+
+
+def merge_force_files(force_files: list, force_record_name: str) -> list:
+    """
+    Combine temporary force files, in simulation order, into force_record_<mode>.json and its binary sidecar.
+    Shards are read one at a time and only their encoded book ids are kept, each key is decoded when it is written.
+    Keys are output in order of first appearance. Returns all description keys.
+    """
+    merged = {}
+    for filename in force_files:
+        header, body = read_force_entries(filename)
+        for search, times_triggered, _, offset, size in header["entries"]:
+            description = tuple((name, value) for name, value in search)
+            if description not in merged:
+                merged[description] = [0, []]
+            merged[description][0] += times_triggered
+            merged[description][1].append(body[offset : offset + size])
+
+    sidecar = ForceEntryWriter()
+    with open(force_record_name, "w", encoding="UTF-8") as f:
+        for index, (description, (times_triggered, encoded_chunks)) in enumerate(merged.items()):
+            book_ids = []
+            for encoded_ids in encoded_chunks:
+                book_ids.extend(decode_book_ids(encoded_ids))
+            force_record = {
+                "search": [{"name": str(name), "value": str(value)} for name, value in description],
+                "timesTriggered": times_triggered,
+                "bookIds": book_ids,
+            }
+            f.write(("[\n" if index == 0 else ",\n") + get_json_list_item(force_record))
+            sidecar.add([list(pair) for pair in description], times_triggered, book_ids)
+        f.write("\n]" if len(merged) > 0 else "[]")
+    sidecar.write(get_force_record_sidecar_name(force_record_name), os.path.getsize(force_record_name))
+    return list(merged)
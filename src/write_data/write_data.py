@@ -6,8 +6,9 @@ import shutil
 import os
 import hashlib
 import json
-import ast
+from array import array
 import zstandard as zstd
+from src.write_data.force_records import write_recorded_events, merge_force_files
 
 
 def get_sha_256(file_to_hash: str):
@@ -65,56 +66,99 @@ def make_force_json(gamestate: object):
         json.dump(force_data, force_file, indent=4)
 
 
-def get_force_options(force_results: dict):
-    """Return JSON ready force keys."""
+def get_force_options(force_results: list):
+    """Return JSON ready force keys from all recorded description keys."""
     force_keys = defaultdict(set)
-    for force in force_results.keys():
+    for force in force_results:
         for key, val in force:
             force_keys[str(key)].add(val)
     return {key: list(val) for key, val in force_keys.items()}
 
 
+class LookupColumns:
+    """
+    Lookup table results of the simulations run by a worker, stored as typed columns in simulation order:
+    book id, payout multiplier (x100), criteria code, basegame and freegame wins.
+    Criteria names are stored once and referenced by their index. Wins capped at an integer wincap are
+    integers, int_wins flags these (1: basegame, 2: freegame) so they are written as before.
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.payouts = array("q")
+        self.criteria_codes = array("H")
+        self.basegame_wins = array("d")
+        self.freegame_wins = array("d")
+        self.int_wins = bytearray()
+        self.criteria_names = []
+        self.criteria_index = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, book_json: dict) -> None:
+        """Append the lookup table values of a JSON-ready book."""
+        criteria = book_json["criteria"]
+        code = self.criteria_index.get(criteria)
+        if code is None:
+            code = len(self.criteria_names)
+            self.criteria_index[criteria] = code
+            self.criteria_names.append(criteria)
+        self.ids.append(book_json["id"])
+        self.payouts.append(book_json["payoutMultiplier"])
+        self.criteria_codes.append(code)
+        self.basegame_wins.append(book_json["baseGameWins"])
+        self.freegame_wins.append(book_json["freeGameWins"])
+        self.int_wins.append(
+            isinstance(book_json["baseGameWins"], int) | (isinstance(book_json["freeGameWins"], int) << 1)
+        )
+
+    def get_order(self) -> list:
+        """Row indexes sorted by book id."""
+        order = range(len(self.ids))
+        if any(self.ids[i] > self.ids[i + 1] for i in range(len(self.ids) - 1)):
+            order = sorted(order, key=self.ids.__getitem__)
+        return order
+
+    def write_lookup_table(self, name: str) -> None:
+        """Write 'id,weight,payout' lines, with an initial weight of 1."""
+        order = self.get_order()
+        ids, payouts = self.ids, self.payouts
+        with open(name, "w", encoding="UTF-8") as f:
+            f.write("".join([f"{ids[i]},1,{payouts[i]}\n" for i in order]))
+
+    def get_win(self, wins: array, row: int, int_flag: int):
+        """Win of a row, as an integer if it was recorded as one."""
+        return int(wins[row]) if self.int_wins[row] & int_flag else wins[row]
+
+    def write_pay_split(self, name: str) -> None:
+        """Write 'id,criteria,basegame wins,freegame wins' lines."""
+        order = self.get_order()
+        ids, codes, names = self.ids, self.criteria_codes, self.criteria_names
+        base, free = self.basegame_wins, self.freegame_wins
+        if not any(self.int_wins):
+            lines = [f"{ids[i]},{names[codes[i]]},{round(base[i], 2)},{round(free[i], 2)}\n" for i in order]
+        else:
+            lines = [
+                f"{ids[i]},{names[codes[i]]},{round(self.get_win(base, i, 1), 2)},{round(self.get_win(free, i, 2), 2)}\n"
+                for i in order
+            ]
+        with open(name, "w", encoding="UTF-8") as f:
+            f.write("".join(lines))
+
+
 def make_lookup_tables(gamestate: object, name: str):
     """Write lookup tables for all simulations."""
-    file = open(name, "w", encoding="UTF-8")
-    sims = list(gamestate.library.keys())
-    sims.sort()
-    for sim in sims:
-        file.write("{},1,{}\n".format(gamestate.library[sim]["id"], gamestate.library[sim]["payoutMultiplier"]))
-    file.close()
+    gamestate.lookup_columns.write_lookup_table(name)
 
 
 def make_lookup_pay_split(gamestate: object, name: str):
     """Record win values from basegame and freegame types."""
-    file = open(name, "w", encoding="UTF-8")
-    sims = list(gamestate.library.keys())
-    sims.sort()
-    for sim in sims:
-        file.write(
-            str(gamestate.library[sim]["id"])
-            + ","
-            + str(gamestate.library[sim]["criteria"])
-            + ","
-            + str(round(gamestate.library[sim]["baseGameWins"], 2))
-            + ","
-            + str(round(gamestate.library[sim]["freeGameWins"], 2))
-            + "\n"
-        )
-    file.close()
-
-
-def write_library_events(gamestate: object, library: list, gametype: str):
-    """Write all unique events within a given mode - with one example application."""
-    unique_event = []
-    event_items = {}
-    for event in library:
-        for instance in event["events"]:
-            lib_event = instance["type"]
-            if lib_event not in unique_event:
-                unique_event.append(lib_event)
-                item_keys = instance.keys()
-                dict_details = {key: instance[key] for key in item_keys if key != "index"}
-                event_items[lib_event] = dict_details
+    gamestate.lookup_columns.write_pay_split(name)
+
+
+def write_event_items(gamestate: object, event_items: dict, gametype: str):
+    """Write one example of each event type within a given mode."""
     json_object = json.dumps(event_items, indent=4)
     with open(
         os.path.join(gamestate.output_files.config_path, f"event_config_{gametype}.json"),
@@ -124,36 +168,22 @@ def write_library_events(gamestate: object, library: list, gametype: str):
         f.write(json_object)
 
 
-def output_lookup_and_force_files(
-    threads: int,
-    batching_size: int,
-    game_id: str,
-    betmode: str,
-    gamestate: object,
-    num_sims: int = 1000000,
-    compress: bool = True,
-):
-    """Combine temporary lookup tables and force files into a single output."""
-    print("Saving books for ", game_id, "in", betmode)
-    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+def write_final_books(gamestate: object, betmode: str, shard_indexes: list, compress: bool):
+    """Combine the temporary books of each (thread_index, repeat_count) chunk, in simulation order, into the final books."""
     file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_multi_thread_name(betmode, thread, repeat_index, compress)
-            )
+    for thread, repeat_index in shard_indexes:
+        file_list.append(gamestate.output_files.get_temp_multi_thread_name(betmode, thread, repeat_index, compress))
 
     if compress:
         temp_book_output_path = os.path.join(gamestate.output_files.book_path, "temp_book_output.json")
-        with open(temp_book_output_path, "w", encoding="UTF-8") as outfile:
+        with open(temp_book_output_path, "wb") as outfile:
             for fname in file_list:
                 with open(fname, "rb") as infile:
-                    decompressed = zstd.ZstdDecompressor().decompress(infile.read())
-                    outfile.write(decompressed.decode("UTF-8"))
+                    zstd.ZstdDecompressor().copy_stream(infile, outfile)
 
         final_out = gamestate.output_files.get_final_book_name(betmode, True)
         with open(temp_book_output_path, "rb") as f_in, open(final_out, "wb") as f_out:
-            f_out.write(zstd.ZstdCompressor().compress(f_in.read()))
+            zstd.ZstdCompressor().copy_stream(f_in, f_out, size=os.path.getsize(temp_book_output_path))
 
         os.remove(temp_book_output_path)
     else:
@@ -172,47 +202,51 @@ def output_lookup_and_force_files(
                             outfile.write(file_data)
                         elif id == 0 and len(file_list) > 1:
                             outfile.write(file_data[:-1])  # don't write final ']'
+                        # ", " between chunks as within them, so the array does not depend on the chunk split
                         elif id != len(file_list) - 1:
-                            outfile.write("," + file_data[1:-1])  # don't write first or last '[/]'
+                            outfile.write(", " + file_data[1:-1])  # don't write first or last '[/]'
                         else:
-                            outfile.write("," + file_data[1::])  # dont write first '[', write last ']'
+                            outfile.write(", " + file_data[1::])  # dont write first '[', write last ']'
 
-    print("Saving force files for", game_id, "in", betmode)
-    force_results_dict = {}
-    file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_force_name(betmode, thread, repeat_index),
-            )
 
-    for filename in file_list:
-        force_chunk = ast.literal_eval(json.load(open(filename, "r", encoding="UTF-8")))
-        for key in force_chunk:
-            if force_results_dict.get(key) is not None:
-                force_results_dict[key]["timesTriggered"] += force_chunk[key]["timesTriggered"]
-                force_results_dict[key]["bookIds"] += force_chunk[key]["bookIds"]
-            else:
-                force_results_dict[key] = force_chunk[key]
-
-    force_results_dict_just_for_rob = []
-    for force_combination in force_results_dict:
-        search_dict = []
-        for key in force_combination:
-            search_dict.append({"name": str(key[0]), "value": str(key[1])})
-        force_dict = {
-            "search": search_dict,
-            "timesTriggered": force_results_dict[force_combination]["timesTriggered"],
-            "bookIds": force_results_dict[force_combination]["bookIds"],
-        }
-        force_results_dict_just_for_rob.append(force_dict)
+def output_lookup_and_force_files(
+    threads: int,
+    batching_size: int,
+    game_id: str,
+    betmode: str,
+    gamestate: object,
+    num_sims: int = 1000000,
+    compress: bool = True,
+    shard_indexes: list = None,
+    stats_only: bool = False,
+):
+    """Combine temporary lookup tables and force files into a single output.
+    shard_indexes lists the (thread_index, repeat_count) temp files in simulation order.
+    Stats-only runs write no books, and books left by a previous run of the betmode are removed.
+    The event catalog combined from all chunks (gamestate.combine_event_items) is written once if write_event_list is set."""
+    if shard_indexes is None:
+        num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+        shard_indexes = [(thread, repeat_index) for repeat_index in range(num_repeats) for thread in range(threads)]
+    if stats_only:
+        for book_name in [gamestate.output_files.get_final_book_name(betmode, c) for c in (True, False)]:
+            if os.path.isfile(book_name):
+                print("Removing books of a previous run:", book_name)
+                os.remove(book_name)
+    else:
+        print("Saving books for ", game_id, "in", betmode)
+        write_final_books(gamestate, betmode, shard_indexes, compress)
+        if gamestate.config.write_event_list:
+            write_event_items(gamestate, gamestate.mode_event_items.get(betmode, {}), betmode)
+    gamestate.mode_event_items.pop(betmode, None)
 
-    json_object_for_rob = json.dumps(force_results_dict_just_for_rob, indent=4)
+    print("Saving force files for", game_id, "in", betmode)
+    file_list = []
+    for thread, repeat_index in shard_indexes:
+        file_list.append(gamestate.output_files.get_temp_force_name(betmode, thread, repeat_index))
     force_record_path = os.path.join(gamestate.output_files.force_path, f"force_record_{betmode}.json")
-    with open(force_record_path, "w", encoding="UTF-8") as file:
-        file.write(json_object_for_rob)
+    force_descriptions = merge_force_files(file_list, force_record_path)
 
-    forceResultKeys = get_force_options(force_results_dict)
+    forceResultKeys = get_force_options(force_descriptions)
     json_file_path = os.path.join(gamestate.output_files.force_path, "force.json")
     try:
         with open(json_file_path, "r", encoding="UTF-8") as file:
@@ -227,14 +261,9 @@ def output_lookup_and_force_files(
     weights_plus_wins_file_list = []
     segmented_lut_file_list = []
     print("Saving LUTs for", game_id, "in", betmode)
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            weights_plus_wins_file_list += [
-                gamestate.output_files.get_temp_lookup_name(betmode, thread, repeat_index)
-            ]
-            segmented_lut_file_list += [
-                gamestate.output_files.get_temp_segmented_name(betmode, thread, repeat_index)
-            ]
+    for thread, repeat_index in shard_indexes:
+        weights_plus_wins_file_list += [gamestate.output_files.get_temp_lookup_name(betmode, thread, repeat_index)]
+        segmented_lut_file_list += [gamestate.output_files.get_temp_segmented_name(betmode, thread, repeat_index)]
 
     with open(
         gamestate.output_files.get_final_lookup_name(betmode),
@@ -261,28 +290,107 @@ def output_lookup_and_force_files(
                 outfile.write(infile.read())
 
 
-def write_json(gamestate, filename: str):
-    """Convert the list of dictionaries to a JSON-encoded string and compress it in chunks."""
-    json_objects = [json.dumps(item) for item in gamestate.library.values()]
-    combined_data = "\n".join(json_objects) + "\n"
-
-    if filename.endswith(".zst"):
-        compressor = zstd.ZstdCompressor()
-        compressed_data = compressor.compress(combined_data.encode("UTF-8"))
-        with open(filename, "wb") as f:
-            f.write(compressed_data)
-    else:
-        with open(filename, "w", encoding="UTF-8") as f:
-            if not (gamestate.config.output_regular_json):
-                f.write(combined_data)
-            else:
-                j_regular = [item for item in gamestate.library.values()]
-                f.write(json.dumps(j_regular))
+class StreamingBookWriter:
+    """Serialize and write books one at a time as they are accepted, so memory use does not grow with the number of simulations.
+    Output is newline separated books (.jsonl/.jsonl.zst) or, with output_regular_json, a single JSON array (.json)
+    written as json.dumps() would write the list of books.
+    With record_event_items, the first example of each event type written is kept in event_items."""
+
+    def __init__(self, filename: str, output_regular_json: bool = False, record_event_items: bool = True):
+        self.filename = filename
+        self.num_books = 0
+        self.event_items = {}
+        self.record_event_items = record_event_items
+        self.compress = filename.endswith(".zst")
+        self.output_regular_json = output_regular_json and not self.compress
+        if self.compress:
+            self.file = zstd.ZstdCompressor().stream_writer(open(filename, "wb"))
+        else:
+            self.file = open(filename, "w", encoding="UTF-8")
+        if self.output_regular_json:
+            self.write("[")
+
+    def write(self, text: str) -> None:
+        """Write text to the (compressed) output stream."""
+        if self.compress:
+            self.file.write(text.encode("UTF-8"))
+        else:
+            self.file.write(text)
+
+    def write_book(self, book: dict) -> None:
+        """Serialize a single JSON-ready book and record the first example of each event type."""
+        if self.record_event_items:
+            for event in book["events"]:
+                if event["type"] not in self.event_items:
+                    self.event_items[event["type"]] = {key: val for key, val in event.items() if key != "index"}
+        book_string = json.dumps(book)
+        if self.output_regular_json:
+            self.write(book_string if self.num_books == 0 else ", " + book_string)
+        else:
+            self.write(book_string + "\n")
+        self.num_books += 1
+
+    def close(self) -> None:
+        """Finalize and close the output file."""
+        if self.output_regular_json:
+            self.write("]")
+        elif self.num_books == 0:
+            self.write("\n")
+        self.file.close()
 
 
 def print_recorded_wins(gamestate: object, name: str = ""):
-    """Temporary file generation for wins/recorded results."""
-    json_object = json.dumps(str(gamestate.recorded_events), indent=4)
-    file = open(name, "w", encoding="UTF-8")
-    file.write(json_object)
-    file.close()
+    """Temporary file generation for wins/recorded results, in the binary force record format."""
+    write_recorded_events(name, gamestate.recorded_events)
+
+
+def combine_criteria_stats(chunk_stats: list) -> dict:
+    """Sum the per-criteria spin attempt counters of several chunks."""
+    criteria_stats = {}
+    for stats in chunk_stats:
+        for criteria, c_stats in stats.items():
+            combined = criteria_stats.setdefault(
+                criteria, {"attempts": 0, "accepted": 0, "rejected_time": 0.0, "total_time": 0.0, "repeats": {}}
+            )
+            for key in ["attempts", "accepted", "rejected_time", "total_time"]:
+                combined[key] += c_stats[key]
+            for repeats, count in c_stats["repeats"].items():
+                combined["repeats"][repeats] = combined["repeats"].get(repeats, 0) + count
+    return criteria_stats
+
+
+def get_repeat_percentile(repeats: dict, percentile: float) -> int:
+    """Number of rejected attempts needed by the given fraction of accepted simulations."""
+    total, cumulative = sum(repeats.values()), 0
+    for num_repeats in sorted(repeats, key=int):
+        cumulative += repeats[num_repeats]
+        if cumulative >= percentile * total:
+            return int(num_repeats)
+    return 0
+
+
+def write_run_report(gamestate: object, betmode: str, criteria_stats: dict, num_sims: int) -> None:
+    """Write spin attempt telemetry for each criteria of a betmode next to the lookup tables."""
+    report = {"betmode": betmode, "num_sims": num_sims, "criteria": {}}
+    total_time = sum(stats["total_time"] for stats in criteria_stats.values())
+    for criteria, stats in sorted(criteria_stats.items(), key=lambda x: -x[1]["rejected_time"]):
+        num_books = max(stats["accepted"], 1)
+        report["criteria"][criteria] = {
+            "attempts": stats["attempts"],
+            "accepted": stats["accepted"],
+            "acceptance_rate": round(stats["accepted"] / max(stats["attempts"], 1), 6),
+            "mean_repeats": round((stats["attempts"] - stats["accepted"]) / num_books, 3),
+            "p99_repeats": get_repeat_percentile(stats["repeats"], 0.99),
+            "max_repeats": max((int(r) for r in stats["repeats"]), default=0),
+            "rejected_time": round(stats["rejected_time"], 3),
+            "total_time": round(stats["total_time"], 3),
+            "share_of_run_time": round(stats["total_time"] / total_time, 4) if total_time > 0 else 0.0,
+        }
+        print(
+            f"Criteria '{criteria}': {stats['accepted']} books from {stats['attempts']} attempts,",
+            f"mean repeats {report['criteria'][criteria]['mean_repeats']},",
+            f"p99 repeats {report['criteria'][criteria]['p99_repeats']},",
+            f"{report['criteria'][criteria]['rejected_time']}s in rejected attempts.",
+        )
+    with open(gamestate.output_files.get_run_report_name(betmode), "w", encoding="UTF-8") as f:
+        json.dump(report, f, indent=4)
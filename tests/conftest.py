@@ -0,0 +1,24 @@
+"""Shared fixtures for tests running the inkgame sample game."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "games", "inkgame"))
+
+from game_config import GameConfig
+from gamestate import GameState
+
+
+@pytest.fixture
+def inkgame_state():
+    """Create inkgame gamestates, setting any given config attributes first."""
+
+    def create_gamestate(**config_values) -> GameState:
+        config = GameConfig()
+        for name, value in config_values.items():
+            setattr(config, name, value)
+        return GameState(config)
+
+    return create_gamestate
@@ -0,0 +1,35 @@
+"""Test that boards drawn as integer-encoded grids give the same books as Symbol boards."""
+
+from src.calculations.board_grid import BoardGrid
+
+
+def run_books(inkgame_state, encoded_boards: bool) -> list:
+    gamestate = inkgame_state(encoded_boards=encoded_boards)
+    gamestate.betmode = "base"
+    gamestate.criteria = "0"
+    for sim in range(10):
+        gamestate.run_spin(sim)
+    return [gamestate.library[sim + 1] for sim in range(10)]
+
+
+def test_encoded_boards_match_symbol_boards(inkgame_state):
+    assert run_books(inkgame_state, encoded_boards=True) == run_books(inkgame_state, encoded_boards=False)
+
+
+def test_grid_creates_symbols_on_access(inkgame_state):
+    gamestate = inkgame_state(encoded_boards=True)
+    gamestate.betmode = "base"
+    gamestate.criteria = "0"
+    gamestate.reset_book()
+    gamestate.create_board_reelstrips()
+    board = gamestate.board
+    assert isinstance(board, BoardGrid)
+
+    prototype = gamestate.symbol_storage.symbols[board.get_name(0, 0)]
+    assert board.peek(0, 0) is prototype or (0, 0) in board.symbols
+    symbol = board[0][0]
+    assert symbol is not prototype and board.peek(0, 0) is symbol and board[0][0] is symbol
+
+    board[1][-1] = gamestate.create_symbol("S")
+    assert board.get_name(1, len(board[1]) - 1) == "S" and board.view()[1][-1].name == "S"
+    assert [sym.name for sym in board.to_symbols()[1]] == [board.get_name(1, row) for row in range(len(board[1]))]
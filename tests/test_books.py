@@ -0,0 +1,27 @@
+"""Test the optional check for book events modified after being recorded."""
+
+import pytest
+from src.state.books import Book
+
+
+def test_book_events_are_not_copied():
+    book = Book(1, "basegame")
+    event = {"index": 0, "type": "reveal", "board": [[{"name": "H1"}]]}
+    book.add_event(event)
+    assert book.to_json()["events"][0] is event
+
+
+def test_check_events_allows_appended_items():
+    book = Book(1, "basegame", check_events=True)
+    book.add_event({"index": 0, "type": "setWin", "amount": 10})
+    book.append_book_items(0, {"amount": 20})
+    assert book.to_json()["events"] == [{"index": 0, "type": "setWin", "amount": 20}]
+
+
+def test_check_events_detects_modified_events():
+    book = Book(1, "basegame", check_events=True)
+    positions = [{"reel": 0, "row": 1}]
+    book.add_event({"index": 0, "type": "freeSpinTrigger", "positions": positions})
+    positions[0]["row"] += 1
+    with pytest.raises(RuntimeError):
+        book.to_json()
@@ -0,0 +1,76 @@
+"""Test that create_books output does not depend on the number of threads, compression or mode scheduling."""
+
+import os
+import sys
+import json
+import subprocess
+import pytest
+import zstandard as zstd
+
+PROJECT_PATH = os.path.join(os.path.dirname(__file__), "..")
+MODES = ["base", "bonus"]
+
+# Each game imports its modules by bare name (gamestate, game_config, ...), so every run gets its own interpreter.
+RUN_SCRIPT = """
+import sys, json
+project_path, game_id, games_path, threads, compress, sequential = sys.argv[1:]
+sys.path[:0] = [project_path, project_path + "/games/" + game_id]
+import src.config.output_filenames as output_filenames
+import src.state.run_sims as run_sims
+from game_config import GameConfig
+from gamestate import GameState
+
+output_filenames.PATH_TO_GAMES = games_path
+pools = []
+create_pool = run_sims.create_sim_pool
+run_sims.create_sim_pool = lambda *args: pools.append(create_pool(*args)) or pools[-1]
+num_sim_args = {"base": 150, "bonus": 60}
+for mode_sims in [{mode: sims} for mode, sims in num_sim_args.items()] if sequential == "1" else [num_sim_args]:
+    config = GameConfig()
+    gamestate = GameState(config)
+    run_sims.create_books(gamestate, config, mode_sims, 20, int(threads), compress == "1", False, reuse_outputs=False)
+print(json.dumps({"pools": len(pools)}))
+"""
+
+
+def create_books(games_path: str, game_id: str, threads: int, compress: bool, sequential: bool) -> dict:
+    """Run create_books for the base and bonus modes of a sample game, returning all compared outputs."""
+    args = [PROJECT_PATH, game_id, games_path, str(threads), str(int(compress)), str(int(sequential))]
+    result = subprocess.run(
+        [sys.executable, "-c", RUN_SCRIPT, *args], capture_output=True, text=True, cwd=PROJECT_PATH, check=True
+    )
+    library_path = os.path.join(games_path, game_id, "library")
+    outputs = json.loads(result.stdout.strip().splitlines()[-1])
+    for mode in MODES:
+        if compress:
+            with open(os.path.join(library_path, "publish_files", f"books_{mode}.jsonl.zst"), "rb") as f:
+                text = zstd.ZstdDecompressor().decompressobj().decompress(f.read()).decode("UTF-8")
+            outputs[f"books_{mode}"] = [json.loads(line) for line in text.splitlines()]
+        else:
+            with open(os.path.join(library_path, "books", f"books_{mode}.json"), "r", encoding="UTF-8") as f:
+                text = f.read()
+            outputs[f"books_{mode}"] = json.loads(text)
+            assert text == json.dumps(outputs[f"books_{mode}"])
+        for filename in [
+            f"lookup_tables/lookUpTable_{mode}.csv",
+            f"lookup_tables/lookUpTableSegmented_{mode}.csv",
+            f"publish_files/lookUpTable_{mode}_0.csv",
+            f"forces/force_record_{mode}.json",
+            f"forces/force_record_{mode}.bin",
+        ]:
+            with open(os.path.join(library_path, filename), "rb") as f:
+                outputs[filename] = f.read()
+    return outputs
+
+
+@pytest.mark.parametrize("game_id", ["0_0_lines", "0_0_cluster"])
+def test_outputs_match_single_thread_runs(tmp_path, game_id):
+    single = create_books(str(tmp_path / "single"), game_id, threads=1, compress=False, sequential=True)
+    threaded = create_books(str(tmp_path / "threaded"), game_id, threads=3, compress=False, sequential=False)
+    compressed = create_books(str(tmp_path / "compressed"), game_id, threads=3, compress=True, sequential=False)
+
+    assert single.pop("pools") == 0
+    assert threaded.pop("pools") == 1 and compressed.pop("pools") == 1
+    assert [len(single[f"books_{mode}"]) for mode in MODES] == [150, 60]
+    assert threaded == single
+    assert compressed == single
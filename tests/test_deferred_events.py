@@ -0,0 +1,19 @@
+"""Test that deferring events of rejected spin attempts does not change the books."""
+
+
+def run_books(inkgame_state, defer_events: bool) -> list:
+    gamestate = inkgame_state()
+    gamestate.betmode = "base"
+    gamestate.criteria = "0"
+    books = []
+    for sim in range(10):
+        gamestate.defer_events = defer_events
+        gamestate.run_spin(sim)
+        books.append((gamestate.library[sim + 1], gamestate.spin_attempts))
+    return books
+
+
+def test_deferred_events_match_recorded_events(inkgame_state):
+    books = run_books(inkgame_state, defer_events=False)
+    assert any(attempts > 1 for _, attempts in books)
+    assert run_books(inkgame_state, defer_events=True) == books
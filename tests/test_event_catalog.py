@@ -0,0 +1,32 @@
+"""Test that event catalogs combined from several chunks match the catalog of a single chunk."""
+
+import os
+
+
+def get_event_items(inkgame_state, temp_path: str, chunks: list) -> dict:
+    os.makedirs(temp_path)
+    gamestate = inkgame_state()
+    gamestate.output_files.temp_path = temp_path
+    for thread_index, sims in enumerate(chunks):
+        gamestate.run_sim_range(
+            "base",
+            {sim: "freegame" if sim % 4 == 0 else "basegame" for sim in sims},
+            sims,
+            thread_index,
+            0,
+            compress=False,
+            write_event_list=True,
+            simulation_seeds={sim: sim for sim in sims},
+        )
+        gamestate.combine_event_items(gamestate.event_items, "base")
+    return gamestate.mode_event_items["base"]
+
+
+def test_combined_event_items_match_single_chunk(tmp_path, inkgame_state):
+    single = get_event_items(inkgame_state, str(tmp_path / "single"), [range(12)])
+    combined = get_event_items(
+        inkgame_state, str(tmp_path / "combined"), [range(0, 3), range(3, 8), range(8, 12)]
+    )
+    assert "freeSpinTrigger" in single
+    assert list(combined) == list(single)
+    assert combined == single
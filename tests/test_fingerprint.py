@@ -0,0 +1,36 @@
+"""Test betmode fingerprint helpers and the cache of previous outputs."""
+
+import os
+from src.state.fingerprint import FingerprintCache, get_reel_names, to_fingerprint_data
+
+
+def test_fingerprint_data_ignores_ordering():
+    first = {(3, "H1"): 1, (4, "H1"): 2, "syms": {"W", "S"}}
+    second = {"syms": {"S", "W"}, (4, "H1"): 2, (3, "H1"): 1}
+    assert to_fingerprint_data(first) == to_fingerprint_data(second)
+    assert to_fingerprint_data(first) != to_fingerprint_data({(3, "H1"): 1, (4, "H1"): 3, "syms": {"W", "S"}})
+
+
+def test_get_reel_names_from_conditions():
+    conditions = {
+        "reel_weights": {"basegame": {"BR0": 1}, "freegame": {"FR0": 1, "FRWCAP": 5}},
+        "mult_values": {"freegame": {2: 10}},
+    }
+    assert get_reel_names(conditions, {"BR0", "FR0", "FRWCAP", "BR1"}) == {"BR0", "FR0", "FRWCAP"}
+
+
+def test_cache_requires_matching_fingerprint_and_files(tmp_path):
+    cache_name = os.path.join(tmp_path, "mode_fingerprints.json")
+    output_file = os.path.join(tmp_path, "lookUpTable_base.csv")
+    with open(output_file, "w", encoding="UTF-8") as f:
+        f.write("1,1,0\n")
+    FingerprintCache(cache_name).record("base", "abc", [output_file], ["symbol"], [1.0, 1.0, 0.0])
+
+    cache = FingerprintCache(cache_name)
+    assert cache.get_cached("base", "abc", [output_file])["force_keys"] == ["symbol"]
+    assert cache.get_cached("base", "def", [output_file]) is None
+    assert cache.get_cached("bonus", "abc", [output_file]) is None
+
+    with open(output_file, "a", encoding="UTF-8") as f:
+        f.write("2,1,0\n")
+    assert cache.get_cached("base", "abc", [output_file]) is None
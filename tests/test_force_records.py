@@ -0,0 +1,90 @@
+"""Test accumulation of recorded force descriptions and the binary force record format."""
+
+import json
+from array import array
+
+from src.state.state import MAX_DESCRIPTION_KEYS
+from src.write_data.force_records import (
+    encode_book_ids,
+    decode_book_ids,
+    get_force_record_sidecar_name,
+    write_force_record_sidecar,
+    load_force_record,
+    write_recorded_events,
+    merge_force_files,
+)
+
+
+def imprint_book(gamestate, sim: int, descriptions: list) -> None:
+    gamestate.betmode = "base"
+    gamestate.sim = sim
+    gamestate.reset_book()
+    for description in descriptions:
+        gamestate.record(description)
+    gamestate.imprint_wins()
+
+
+def test_book_ids_recorded_once_per_description(inkgame_state):
+    gamestate = inkgame_state()
+    gamestate.recorded_events = {}
+    imprint_book(gamestate, 3, [{"kind": 3, "symbol": "S"}, {"symbol": "S", "kind": 3}])
+    imprint_book(gamestate, 5, [{"kind": 3, "symbol": "S"}, {"kind": "3", "symbol": "S"}])
+    imprint_book(gamestate, 8, [{"kind": 4, "symbol": "S"}])
+
+    description = (("kind", "3"), ("symbol", "S"))
+    assert gamestate.recorded_events[description]["timesTriggered"] == 2
+    assert list(gamestate.recorded_events[description]["bookIds"]) == [3, 5]
+    assert list(gamestate.recorded_events[(("kind", "4"), ("symbol", "S"))]["bookIds"]) == [8]
+    assert gamestate.get_description_key({"kind": 3, "symbol": "S"}) is gamestate.get_description_key(
+        {"kind": 3, "symbol": "S"}
+    )
+
+
+def test_description_keys_are_bounded(inkgame_state):
+    gamestate = inkgame_state()
+    for kind in range(MAX_DESCRIPTION_KEYS + 10):
+        assert gamestate.get_description_key({"kind": kind}) == (("kind", str(kind)),)
+    assert len(gamestate.description_keys) == MAX_DESCRIPTION_KEYS
+
+
+def test_binary_force_record_round_trip(tmp_path):
+    force_records = [
+        {"search": [{"name": "kind", "value": "3"}], "timesTriggered": 4, "bookIds": [1, 2, 130, 100000]},
+        {"search": [{"name": "kind", "value": "4"}], "timesTriggered": 0, "bookIds": []},
+    ]
+    assert decode_book_ids(encode_book_ids([100000, 1, 130, 2])) == [1, 2, 130, 100000]
+
+    json_name = tmp_path / "force_record_base.json"
+    json_name.write_text(json.dumps(force_records, indent=4))
+    write_force_record_sidecar(get_force_record_sidecar_name(str(json_name)), force_records, json_name.stat().st_size)
+    assert load_force_record(str(json_name)) == force_records
+
+    # a sidecar written for a different JSON force record is ignored
+    force_records[0]["bookIds"] = [5]
+    json_name.write_text(json.dumps(force_records))
+    assert load_force_record(str(json_name)) == force_records
+
+
+def test_merge_force_files_matches_json_record(tmp_path):
+    shards = [
+        {(("kind", "3"), ("symbol", "S")): {"timesTriggered": 2, "bookIds": array("q", [1, 4])}},
+        {
+            (("kind", "4"), ("symbol", "S")): {"timesTriggered": 1, "bookIds": array("q", [6])},
+            (("kind", "3"), ("symbol", "S")): {"timesTriggered": 1, "bookIds": array("q", [300])},
+        },
+    ]
+    force_files = []
+    for index, recorded_events in enumerate(shards):
+        force_files.append(str(tmp_path / f"force_base_{index}_0.bin"))
+        write_recorded_events(force_files[-1], recorded_events)
+
+    force_record_name = str(tmp_path / "force_record_base.json")
+    descriptions = merge_force_files(force_files, force_record_name)
+    expected = [
+        {"search": [{"name": "kind", "value": "3"}, {"name": "symbol", "value": "S"}], "timesTriggered": 3, "bookIds": [1, 4, 300]},
+        {"search": [{"name": "kind", "value": "4"}, {"name": "symbol", "value": "S"}], "timesTriggered": 1, "bookIds": [6]},
+    ]
+    assert descriptions == list(shards[1].keys())[::-1]
+    with open(force_record_name, "r", encoding="UTF-8") as f:
+        assert f.read() == json.dumps(expected, indent=4)
+    assert load_force_record(force_record_name) == expected
@@ -0,0 +1,26 @@
+"""Test that lookup tables written from result columns match the previous per-book output."""
+
+from src.write_data.write_data import LookupColumns
+
+
+def test_lookup_columns_output(tmp_path):
+    books = [
+        {"id": 7, "payoutMultiplier": 500000, "criteria": "wincap", "baseGameWins": 0.0, "freeGameWins": 5000},
+        {"id": 3, "payoutMultiplier": 120, "criteria": "basegame", "baseGameWins": 1.2, "freeGameWins": 0.0},
+        {"id": 5, "payoutMultiplier": 0, "criteria": "0", "baseGameWins": 0.0, "freeGameWins": 0.0},
+    ]
+    columns = LookupColumns()
+    for book in books:
+        columns.add(book)
+    assert len(columns) == 3
+    assert columns.criteria_names == ["wincap", "basegame", "0"]
+
+    columns.write_lookup_table(str(tmp_path / "lut.csv"))
+    columns.write_pay_split(str(tmp_path / "segmented.csv"))
+    books.sort(key=lambda book: book["id"])
+    with open(tmp_path / "lut.csv", "r", encoding="UTF-8") as f:
+        assert f.read() == "".join("{},1,{}\n".format(b["id"], b["payoutMultiplier"]) for b in books)
+    with open(tmp_path / "segmented.csv", "r", encoding="UTF-8") as f:
+        assert f.read() == "".join(
+            f"{b['id']},{b['criteria']},{round(b['baseGameWins'], 2)},{round(b['freeGameWins'], 2)}\n" for b in books
+        )
@@ -0,0 +1,32 @@
+"""Test the cached reelstop positions used to force special boards."""
+
+
+def get_gamestate(inkgame_state):
+    gamestate = inkgame_state()
+    gamestate.betmode = "base"
+    gamestate.criteria = "0"
+    gamestate.reset_book()
+    return gamestate
+
+
+def test_reelstop_index_matches_reelstrips(inkgame_state):
+    gamestate = get_gamestate(inkgame_state)
+    for reel_id, reels in gamestate.config.reels.items():
+        for target in ["scatter", "S", "M", "H1"]:
+            names = gamestate.config.special_symbols.get(target, [target])
+            positions, probs = gamestate.get_reelstop_index(reel_id, target)
+            assert positions == [[s for s, name in enumerate(reel) if name in names] for reel in reels]
+            assert probs == [len(positions[r]) / len(reel) for r, reel in enumerate(reels)]
+            assert gamestate.get_reelstop_index(reel_id, target)[0] is positions
+
+    stops = gamestate.get_syms_on_reel(reel_id, "scatter")
+    stops[0].append(-1)
+    assert -1 not in gamestate.get_reelstop_index(reel_id, "scatter")[0][0]
+
+
+def test_forced_boards_hold_target_symbols(inkgame_state):
+    gamestate = get_gamestate(inkgame_state)
+    gamestate.rng.seed(1)
+    for num_scatters in [3, 4]:
+        gamestate.force_special_board("scatter", num_scatters)
+        assert gamestate.count_special_symbols("scatter") == num_scatters
@@ -0,0 +1,38 @@
+"""Test that each simulation draws from its own reproducible random stream."""
+
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "games", "inkgame"))
+
+from game_config import GameConfig
+from gamestate import GameState
+from src.calculations.statistics import get_stream_seed
+
+
+def test_stream_seed_depends_on_mode_criteria_and_sim():
+    seed = get_stream_seed("base", "basegame", 5)
+    assert seed == get_stream_seed("base", "basegame", 5)
+    assert seed != get_stream_seed("bonus", "basegame", 5)
+    assert seed != get_stream_seed("base", "freegame", 5)
+    assert seed != get_stream_seed("base", "basegame", 6)
+
+
+def draw_board_names(gamestate, sim: int) -> list:
+    gamestate.reset_seed(sim)
+    gamestate.reset_book()
+    random.random()  # draws from the global random module do not affect the simulation stream
+    gamestate.draw_board(emit_event=False)
+    return [[sym.name for sym in reel] for reel in gamestate.board]
+
+
+def test_board_independent_of_previous_simulations():
+    config = GameConfig()
+    gamestate = GameState(config)
+    gamestate.betmode = "base"
+    gamestate.criteria = config.get_betmode("base").get_distributions()[-1].get_criteria()
+    first_board = draw_board_names(gamestate, 5)
+    for sim in range(5):
+        draw_board_names(gamestate, sim)
+    assert draw_board_names(gamestate, 5) == first_board
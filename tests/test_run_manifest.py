@@ -0,0 +1,44 @@
+"""Test recording and reloading of completed simulation chunks."""
+
+import os
+from src.state.run_manifest import RunManifest, get_run_key
+from src.write_data.write_data import get_sha_256
+
+
+def make_result(tmp_path, content: str) -> dict:
+    chunk_file = tmp_path / "books_base_0_0.jsonl"
+    chunk_file.write_text(content)
+    return {
+        "betmode": "base",
+        "thread_index": 0,
+        "repeat_count": 0,
+        "force_keys": ["symbol"],
+        "wins": [1.0, 0.5, 0.5],
+        "file_hashes": {chunk_file.name: get_sha_256(str(chunk_file))},
+    }
+
+
+def test_run_key_depends_on_criteria():
+    details = {"betmode": "base", "num_sims": 3}
+    assert get_run_key(details, ["0", "basegame", "0"]) == get_run_key(details, ["0", "basegame", "0"])
+    assert get_run_key(details, ["0", "basegame", "0"]) != get_run_key(details, ["0", "0", "basegame"])
+
+
+def test_manifest_reloads_completed_chunks(tmp_path):
+    manifest_name = os.path.join(tmp_path, "run_manifest.jsonl")
+    result = make_result(tmp_path, "{}\n")
+    RunManifest(manifest_name).record("key", result)
+    with open(manifest_name, "a", encoding="UTF-8") as f:
+        f.write('{"partial": ')
+
+    reloaded = RunManifest(manifest_name)
+    completed = reloaded.get_completed("key", "base", 0, 0, str(tmp_path))
+    assert completed["force_keys"] == ["symbol"]
+    assert reloaded.get_completed("other_key", "base", 0, 0, str(tmp_path)) is None
+
+
+def test_manifest_rejects_modified_files(tmp_path):
+    manifest_name = os.path.join(tmp_path, "run_manifest.jsonl")
+    RunManifest(manifest_name).record("key", make_result(tmp_path, "{}\n"))
+    (tmp_path / "books_base_0_0.jsonl").write_text("{}\n{}\n")
+    assert RunManifest(manifest_name).get_completed("key", "base", 0, 0, str(tmp_path)) is None
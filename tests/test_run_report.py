@@ -0,0 +1,27 @@
+"""Test aggregation of per-criteria spin attempt telemetry."""
+
+from src.write_data.write_data import combine_criteria_stats, get_repeat_percentile
+
+
+def make_stats(attempts: int, accepted: int, repeats: dict) -> dict:
+    return {"attempts": attempts, "accepted": accepted, "rejected_time": 1.0, "total_time": 2.0, "repeats": repeats}
+
+
+def test_combine_criteria_stats():
+    combined = combine_criteria_stats(
+        [
+            {"wincap": make_stats(12, 2, {"1": 1, "9": 1})},
+            {"wincap": make_stats(5, 1, {"4": 1}), "0": make_stats(3, 3, {"0": 3})},
+        ]
+    )
+    assert combined["wincap"]["attempts"] == 17 and combined["wincap"]["accepted"] == 3
+    assert combined["wincap"]["repeats"] == {"1": 1, "9": 1, "4": 1}
+    assert combined["wincap"]["rejected_time"] == 2.0
+    assert combined["0"]["repeats"] == {"0": 3}
+
+
+def test_get_repeat_percentile():
+    repeats = {"0": 98, "3": 1, "40": 1}
+    assert get_repeat_percentile(repeats, 0.5) == 0
+    assert get_repeat_percentile(repeats, 0.99) == 3
+    assert get_repeat_percentile(repeats, 1.0) == 40
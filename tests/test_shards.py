@@ -0,0 +1,43 @@
+"""Test splitting of shard specs into worker chunks."""
+
+import json
+from array import array
+
+from src.state.shards import get_shard_tasks, write_shard_codes, load_shard_assignment
+from src.state.sim_assignment import SimAssignment
+from src.write_data.write_data import get_sha_256
+
+
+def test_shard_tasks_cover_shard_range():
+    spec = {"betmode": "base", "shard_index": 2, "sims": [100, 157], "compress": True}
+    assignment = SimAssignment(["0", "1", "2"], array("B", [i % 3 for i in range(57)]), start=100)
+    tasks = get_shard_tasks(spec, assignment, threads=2, batch_size=10, write_event_list=False)
+    assert [sim for t in tasks for sim in t["sims"]] == list(range(100, 157))
+    assert [t["thread_index"] for t in tasks] == list(range(len(tasks)))
+    assert all(t["repeat_count"] == 2 for t in tasks)
+    assert tasks[0]["sim_to_criteria"][100] == "0" and tasks[-1]["simulation_seeds"][156] == 156
+    assert all(len(t["sim_to_criteria"].codes) == len(t["sims"]) for t in tasks)
+
+
+def test_shard_codes_round_trip(tmp_path):
+    assignment = SimAssignment(["0", "basegame", "freegame"], array("B", [(i * 7) % 3 for i in range(500)]), True)
+    sims = range(123, 389)
+    shard = assignment.get_slice(sims)
+    codes_name = str(tmp_path / "shard_codes_base_1.bin")
+    write_shard_codes(codes_name, shard.codes)
+    spec = {
+        "sims": [sims.start, sims.stop],
+        "criteria_names": shard.criteria_names,
+        "counted_seeds": shard.counted_seeds,
+        "start_counters": shard.start_counters,
+        "code_type": shard.codes.typecode,
+        "codes_file": "shard_codes_base_1.bin",
+        "codes_hash": get_sha_256(codes_name),
+    }
+    spec_file = tmp_path / "shard_spec_base_1.json"
+    spec_file.write_text(json.dumps(spec))
+
+    loaded = load_shard_assignment(str(spec_file), json.loads(spec_file.read_text()))
+    assert [loaded[sim] for sim in sims] == [assignment[sim] for sim in sims]
+    assert [loaded.get_seed(sim) for sim in sims] == [assignment.get_seed(sim) for sim in sims]
+    assert (tmp_path / "shard_codes_base_1.bin").stat().st_size == len(sims)
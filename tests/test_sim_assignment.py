@@ -0,0 +1,39 @@
+"""Test the compact criteria and seed assignment sent to workers."""
+
+import pickle
+import hashlib
+from array import array
+
+from src.state.sim_assignment import SimAssignment, string_to_int
+from src.state.run_manifest import get_run_key
+
+
+def test_chunk_seeds_count_criteria():
+    names = ["0", "basegame", "freegame"]
+    assignment = SimAssignment(names, array("B", [1, 0, 1, 2, 1, 0, 1]), counted_seeds=True)
+    counters = {name: 0 for name in names}
+    expected = []
+    for criteria in assignment:
+        expected.append(string_to_int(criteria) + counters[criteria])
+        counters[criteria] += 1
+
+    assert [assignment.get_seed(sim) for sim in range(len(assignment))] == expected
+    seeds = []
+    for sims in (range(0, 3), range(3, 4), range(4, 7)):
+        chunk_criteria, chunk_seeds = pickle.loads(pickle.dumps(assignment.get_chunk(sims)))
+        assert [chunk_criteria[sim] for sim in sims] == [assignment[sim] for sim in sims]
+        seeds.extend(chunk_seeds[sim] for sim in sims)
+    assert seeds == expected
+
+
+def test_uncounted_seeds_are_simulation_numbers():
+    assignment = SimAssignment(["0", "basegame"], array("B", [1, 1, 0, 1]))
+    _, chunk_seeds = assignment.get_chunk(range(2, 4))
+    assert [chunk_seeds[2], chunk_seeds[3]] == [2, 3]
+
+
+def test_run_key_matches_joined_criteria():
+    assignment = SimAssignment(["0", "basegame"], array("B", [i % 3 == 0 for i in range(250001)]))
+    run_hash = hashlib.sha256(b'{"a": 1}')
+    run_hash.update("\n".join(assignment).encode("UTF-8"))
+    assert get_run_key({"a": 1}, assignment) == run_hash.hexdigest()
@@ -0,0 +1,29 @@
+"""Test splitting of simulation numbers into batches and chunks."""
+
+import pytest
+from src.state.run_sims import split_balanced, get_sim_shards
+
+
+def test_split_balanced_covers_range():
+    shards = split_balanced(range(10, 27), 4)
+    assert [len(s) for s in shards] == [5, 4, 4, 4]
+    assert [sim for s in shards for sim in s] == list(range(10, 27))
+
+
+def test_split_balanced_more_shards_than_sims():
+    shards = split_balanced(range(3), 8)
+    assert shards == [range(0, 1), range(1, 2), range(2, 3)]
+
+
+@pytest.mark.parametrize("num_sims,threads,batch_size", [(401, 3, 47), (1000, 64, 50), (7, 4, 100), (20000, 10, 1000)])
+def test_get_sim_shards_uses_every_sim_once(num_sims, threads, batch_size):
+    shards = get_sim_shards(num_sims, threads, batch_size)
+    all_sims = [sim for batch in shards for chunk in batch for sim in chunk]
+    assert all_sims == list(range(num_sims))
+    for batch in shards:
+        assert sum(len(chunk) for chunk in batch) <= threads * batch_size
+
+
+def test_get_sim_shards_single_thread():
+    shards = get_sim_shards(250, 1, 100)
+    assert shards == [[range(0, 84)], [range(84, 167)], [range(167, 250)]]
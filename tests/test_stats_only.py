@@ -0,0 +1,36 @@
+"""Test that stats-only simulations write the same lookup tables as full simulations, without books."""
+
+import os
+
+
+def run_chunk(inkgame_state, temp_path: str, stats_only: bool) -> dict:
+    os.makedirs(temp_path)
+    gamestate = inkgame_state()
+    gamestate.output_files.temp_path = temp_path
+    sims = range(20)
+    gamestate.run_sim_range(
+        "base",
+        {sim: "0" if sim % 2 else "basegame" for sim in sims},
+        sims,
+        0,
+        0,
+        compress=False,
+        write_event_list=False,
+        simulation_seeds={sim: sim for sim in sims},
+        stats_only=stats_only,
+    )
+    outputs = {}
+    for filename in gamestate.output_files.get_temp_shard_files("base", 0, 0, False):
+        if os.path.isfile(filename):
+            with open(filename, "r", encoding="UTF-8") as f:
+                outputs[os.path.basename(filename)] = f.read()
+    return outputs
+
+
+def test_stats_only_matches_lookup_tables(tmp_path, inkgame_state):
+    full_outputs = run_chunk(inkgame_state, str(tmp_path / "full"), stats_only=False)
+    stats_outputs = run_chunk(inkgame_state, str(tmp_path / "stats"), stats_only=True)
+    book_name = [name for name in full_outputs if name.startswith("books")]
+    assert len(book_name) == 1 and book_name[0] not in stats_outputs
+    del full_outputs[book_name[0]]
+    assert stats_outputs == full_outputs
@@ -0,0 +1,64 @@
+"""Test symbols created from SymbolStorage prototypes."""
+
+import pickle
+import pytest
+from src.calculations.symbol import Symbol, SymbolStorage
+
+
+class SymbolConfig:
+    def __init__(self):
+        self.paytable = {(3, "H1"): 1, (4, "H1"): 2, (3, "W"): 5}
+        self.special_symbols = {"wild": ["W"], "multiplier": ["W"], "scatter": ["S"]}
+
+
+def get_state(symbol) -> dict:
+    state = {
+        "name": symbol.name,
+        "special": symbol.special,
+        "is_paying": symbol.is_paying,
+        "paytable": symbol.paytable,
+        "special_properties": symbol.special_properties,
+    }
+    for attribute in symbol.attributes:
+        state[attribute] = (
+            symbol.get_attribute(attribute) if hasattr(symbol, attribute) else None,
+            symbol.check_attribute(attribute),
+        )
+    return state
+
+
+def test_cloned_symbols_match_new_symbols():
+    config = SymbolConfig()
+    storage = SymbolStorage(config, ["H1", "W", "S", "L1"])
+    for name in storage.symbols:
+        assert get_state(storage.create_symbol_state(name)) == get_state(Symbol(config, name))
+
+
+def test_clones_do_not_share_assigned_attributes():
+    storage = SymbolStorage(SymbolConfig(), ["W"])
+    first = storage.create_symbol_state("W")
+    first.assign_attribute({"multiplier": 3, "explode": True})
+    second = storage.create_symbol_state("W")
+    assert second.multiplier is True and not second.check_attribute("explode")
+    assert storage.symbols["W"].multiplier is True
+    assert first.special_functions is not second.special_functions
+
+
+def test_attribute_flags_follow_assignments():
+    symbol = SymbolStorage(SymbolConfig(), ["H1"]).create_symbol_state("H1")
+    assert not symbol.check_attribute("wild", "multiplier", "explode")
+    symbol.explode = True
+    setattr(symbol, "multiplier", 0)
+    assert symbol.check_attribute("explode") and symbol.check_attribute("multiplier")
+    symbol.assign_attribute({"explode": False})
+    del symbol.multiplier
+    assert not symbol.check_attribute("explode", "multiplier")
+    assert symbol.flags == 0 and not hasattr(symbol, "multiplier")
+
+
+def test_undeclared_attributes_fall_back_with_a_warning():
+    symbol = SymbolStorage(SymbolConfig(), ["H1"]).create_symbol_state("H1")
+    with pytest.warns(UserWarning, match="custom_prize"):
+        symbol.assign_attribute({"custom_prize": 5})
+    assert symbol.get_attribute("custom_prize") == 5 and symbol.check_attribute("custom_prize")
+    assert pickle.loads(pickle.dumps(symbol)).custom_prize == 5
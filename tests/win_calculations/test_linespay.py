@@ -1,8 +1,13 @@
 """Test basic lines-calculation functionality."""
 
+import random
+import numpy as np
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
 from src.calculations.lines import Lines
+from src.calculations.board import Board
+from src.config.betmode import BetMode
+from src.config.distributions import Distribution
 
 
 class GameLinesConfig:
@@ -122,3 +127,49 @@ def test_linespay_mult(gamestate):
 
     windata = Lines.get_lines(gamestate.board, gamestate.config)
     assert windata["totalWin"] == (gamestate.config.paytable[(5, "WM")] * sum([3, 3, 3, 3, 3]))
+
+
+class BoardGamestateTest(Board, GamestateTest):
+    """Test gamestate drawing boards from reelstrips."""
+
+
+def test_linespay_batch():
+    "Boards drawn in a batch follow the reel weights and batched lines-payout matches single boards."
+    config = GameLinesConfig()
+    strip_rng = random.Random(7)
+    config.reels = {
+        strip_id: [[strip_rng.choice(symbols) for _ in range(40)] for _ in range(5)]
+        for strip_id, symbols in [("BR0", ["H1", "H1", "W", "X", "S"]), ("BR1", ["H1", "W", "W", "X"])]
+    }
+    reel_weights = {"BR0": 1, "BR1": 3}
+    distribution = Distribution(criteria="0", quota=1, conditions={"reel_weights": {"basegame": reel_weights}})
+    config.bet_modes = [BetMode("base", 1.0, 0.97, 5000, False, False, False, [distribution])]
+    gamestate = BoardGamestateTest(config)
+    gamestate.create_symbol_map()
+    gamestate.assign_special_sym_function()
+    gamestate.encoded_reels = None
+    gamestate.betmode, gamestate.criteria, gamestate.gametype = "base", "0", "basegame"
+
+    batch = gamestate.draw_board_batch(4000, np.random.default_rng(1))
+    assert batch.codes.shape == (4000, 5, 5) and batch.reel_stops.shape == (4000, 5)
+    assert batch.reelstrip_ids == ["BR0", "BR1"]
+    assert abs(np.mean(batch.reelstrip_index == 1) - 0.75) < 0.03
+    for symbol in ["H1", "W", "X", "S"]:
+        expected = sum(
+            weight * np.mean([reel.count(symbol) / len(reel) for reel in config.reels[strip_id]])
+            for strip_id, weight in reel_weights.items()
+        ) / sum(reel_weights.values())
+        assert abs(np.mean(batch.codes == batch.encoded_reels.codes[symbol]) - expected) < 0.02
+    for index in range(20):
+        strip = config.reels[batch.reelstrip_ids[batch.reelstrip_index[index]]]
+        board = batch.get_board(index)
+        for reel in range(5):
+            stop = batch.reel_stops[index, reel]
+            assert [board.get_name(reel, row) for row in range(5)] == [
+                strip[reel][(stop + row) % len(strip[reel])] for row in range(5)
+            ]
+
+    line_wins = Lines.get_lines_batch(batch, config)
+    assert line_wins.sum() > 0
+    for index in range(len(batch)):
+        assert line_wins[index].sum() == Lines.get_lines(batch.get_board(index), config)["totalWin"]
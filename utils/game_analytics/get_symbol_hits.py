@@ -1,8 +1,8 @@
 """Analyze symbol hit-rates"""
 
-import json
 import os
 from src.config.paths import PATH_TO_GAMES
+from src.write_data.force_records import load_force_record
 
 
 class HitRateCalculations:
@@ -22,10 +22,8 @@ class HitRateCalculations:
         lut_file = os.path.join(
             PATH_TO_GAMES, self.game_id, "library", "publish_files", f"lookUpTable_{self.mode}_0.csv"
         )
-        with open(force_file, "r", encoding="UTF-8") as f:
-            file_dict = json.load(f)
-            all_keys = [d.keys() for d in file_dict]
-        f.close()
+        file_dict = load_force_record(force_file)
+        all_keys = [d.keys() for d in file_dict]
 
         lut_ids = []
         weights = []
@@ -0,0 +1,61 @@
+"""
+Run simulations across several machines sharing a directory.
+    Create shard specs for 4 machines:
+    python3 utils/run_shards.py plan -g 0_0_lines -s /shared/0_0_lines -n 4 -d '{"base": 1e6, "bonus": 1e6}'
+
+    Run a single shard on any machine with access to the directory:
+    python3 utils/run_shards.py run -g 0_0_lines -f /shared/0_0_lines/shard_spec_base_0.json -t 16 -b 10000
+
+    Build the final books, lookup tables and force files once all shards are finished:
+    python3 utils/run_shards.py merge -g 0_0_lines -s /shared/0_0_lines
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import os
+import json
+
+ABS_PATH = Path(__file__).parent.parent
+sys.path.append(str(ABS_PATH))
+
+
+def load_game(game_id: str) -> tuple:
+    """Import the game configuration and gamestate of a game folder."""
+    sys.path.insert(0, os.path.join(ABS_PATH, "games", game_id))
+    from game_config import GameConfig
+    from gamestate import GameState
+
+    config = GameConfig()
+    return config, GameState(config)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["plan", "run", "merge"])
+    parser.add_argument("-g", dest="game_id", type=str, required=True, help="Game folder name: '0_0_lines'")
+    parser.add_argument("-s", dest="shard_path", type=str, help="Shared directory for shard specs and outputs")
+    parser.add_argument("-n", dest="num_shards", type=int, default=1, help="Number of shards per betmode")
+    parser.add_argument("-d", dest="num_sim_args", type=str, help="Must pass JSON string: '{\"mode\": num, ...}'")
+    parser.add_argument("-f", dest="spec_file", type=str, help="Shard spec to run")
+    parser.add_argument("-t", dest="threads", type=int, default=1)
+    parser.add_argument("-b", dest="batch_size", type=int, default=10000)
+    parser.add_argument("--no-compression", dest="compress", action="store_false")
+    arguments = parser.parse_args()
+
+    from src.state.shards import create_shard_specs, run_shard, merge_shards
+
+    game_config, game_state = load_game(arguments.game_id)
+    if arguments.command == "plan":
+        create_shard_specs(
+            game_state,
+            game_config,
+            json.loads(arguments.num_sim_args),
+            arguments.num_shards,
+            arguments.shard_path,
+            arguments.compress,
+        )
+    elif arguments.command == "run":
+        run_shard(game_state, game_config, arguments.spec_file, arguments.threads, arguments.batch_size)
+    else:
+        merge_shards(game_state, game_config, arguments.shard_path)
@@ -4,6 +4,7 @@ import os
 import importlib
 import json
 from typing import List, Dict
+from src.write_data.force_records import load_force_record
 
 
 def load_game_config(game_id: str):
@@ -43,10 +44,8 @@ class ForceTool:
         return os.path.join(self.config.library_path, "forces", f"force_record_{self.target_mode}.json")
 
     def load_force_file(self):
-        "Load JSON format force file."
-        force_name = self.get_force_file_name()
-        with open(force_name, "r", encoding="UTF-8") as f:
-            self.current_force_file = json.loads(f.read())
+        "Load force file, from the binary force record when present."
+        self.current_force_file = load_force_record(self.get_force_file_name())
 
     def print_search_results(self, search_criteria, simulation_ids: List, filename: str, game_mode: str):
         """Record"""